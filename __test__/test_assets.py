@@ -0,0 +1,114 @@
+"""Tests for local avatar/logo thumbnails (src.assets) against a local stub image server."""
+
+import contextlib
+import copy
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import assets, cli, model, render
+from helpers import SAMPLE_DATA, StubServer, grouped_mock
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+def _images(method, path, headers, body):
+    if path == '/missing.png':
+        return 404, {}, b'not found'
+    if headers.get('If-None-Match') == '"v1"':
+        return 304, {'ETag': '"v1"'}, b''
+    return 200, {'Content-Type': 'image/png', 'ETag': '"v1"'}, PNG + path.encode('utf-8')
+
+
+class TestAssetStore(unittest.TestCase):
+    def _model(self, server):
+        logos = {
+            'repo/a': f"{server.url}/a.png",
+            'repo/b': f"{server.url}/a.png",
+            'repo/c': f"{server.url}/c.png",
+            'repo/d': f"{server.url}/missing.png",
+        }
+        with mock.patch.dict(model.CUSTOM_LOGOS, logos):
+            return model.build_readme_model(grouped_mock(SAMPLE_DATA)[0], {})
+
+    def test_thumbnails_are_stored_once_and_linked(self):
+        with tempfile.TemporaryDirectory() as tmp, StubServer(_images) as server, \
+                contextlib.redirect_stdout(io.StringIO()) as out:
+            m = self._model(server)
+            before = copy.deepcopy(m)
+            directory = os.path.join(tmp, 'logos')
+
+            store = assets.AssetStore(directory)
+            local = assets.localize_model(m, store)
+            store.save()
+            self.assertEqual(m, before)
+            self.assertEqual(store.stats(), {'downloaded': 2, 'unchanged': 0, 'failed': 1})
+
+            logos = {row['repo_name']: row['logo_url']
+                     for year in local['years'] for month in year['months'] for row in month['rows']}
+            self.assertEqual(logos['repo/a'], logos['repo/b'])
+            self.assertTrue(logos['repo/a'].startswith(directory + "/"))
+            self.assertTrue(os.path.exists(logos['repo/c']))
+            self.assertEqual(logos['repo/d'], f"{server.url}/missing.png")
+            self.assertIn("could not download", out.getvalue())
+            self.assertEqual(sorted(os.listdir(directory)),
+                             sorted([os.path.basename(logos['repo/a']), os.path.basename(logos['repo/c']),
+                                     assets.MANIFEST_FILE]))
+
+            # Second run: conditional requests, nothing rewritten.
+            store = assets.AssetStore(directory)
+            again = assets.localize_model(m, store)
+            self.assertEqual(again, local)
+            self.assertEqual(store.stats(), {'downloaded': 0, 'unchanged': 2, 'failed': 1})
+            conditional = [headers.get('If-None-Match') for _, path, headers, *_ in server.requests
+                           if path == '/a.png']
+            self.assertEqual(conditional, [None, '"v1"'])
+
+    def test_offline_render_links_stored_thumbnails(self):
+        data, _ = grouped_mock(SAMPLE_DATA)
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(assets.urllib.request, 'urlopen', side_effect=AssertionError), \
+                contextlib.redirect_stdout(io.StringIO()):
+            directory = os.path.join(tmp, 'logos')
+            os.makedirs(directory)
+            with open(os.path.join(directory, '0123456789abcdef.png'), 'wb') as f:
+                f.write(PNG)
+            with open(os.path.join(directory, assets.MANIFEST_FILE), 'w') as f:
+                json.dump({f"https://github.com/repo.png@{assets.LOGO_SIZE}":
+                           {'file': '0123456789abcdef.png'}}, f)
+            snapshot = os.path.join(tmp, 'README_DATA.json')
+            readme = os.path.join(tmp, 'README.md')
+            render.render_outputs(model.build_readme_model(data, {}), {snapshot: render.JsonSink()})
+
+            argv = ['render', '--snapshot', snapshot, '--output', readme, '--assets']
+            with mock.patch.object(cli, 'ASSETS_DIR', directory):
+                self.assertEqual(cli.main(argv), 0)
+            with open(readme) as f:
+                text = f.read()
+        self.assertIn(f'src="{directory}/0123456789abcdef.png"', text)
+        self.assertNotIn('src="https://github.com/repo.png"', text)
+
+    def test_memo_keys_are_rederived(self):
+        month = {'month_number': 1, 'month_name': 'January', 'key': 'k',
+                 'rows': [{'logo_url': 'https://example.invalid/x.png'}]}
+        m = {'featured_projects': [], 'years': [{'year': 2026, 'key': 'y', 'months': [month]}]}
+        store = mock.Mock(localize=lambda requests: {('https://example.invalid/x.png', assets.LOGO_SIZE):
+                                                     'assets/logos/0123456789abcdef.png'})
+        local = assets.localize_model(m, store)
+        self.assertNotEqual(local['years'][0]['key'], 'y')
+        self.assertNotEqual(local['years'][0]['months'][0]['key'], 'k')
+        self.assertEqual(month['rows'][0]['logo_url'], 'https://example.invalid/x.png')
+
+    def test_github_avatars_are_requested_at_display_size(self):
+        self.assertEqual(assets.sized_url("https://github.com/octocat.png", 48),
+                         "https://github.com/octocat.png?size=48")
+        self.assertEqual(assets.sized_url("https://avatars.githubusercontent.com/u/1?v=4&s=460", 120),
+                         "https://avatars.githubusercontent.com/u/1?v=4&size=120")
+        self.assertEqual(assets.sized_url("https://example.com/logo.png", 48), "https://example.com/logo.png")
+
+
+if __name__ == '__main__':
+    unittest.main()
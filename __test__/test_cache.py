@@ -0,0 +1,205 @@
+"""Tests for the persistent PR cache (src.cache) and its use in fetch_urls."""
+
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from src import github, model, render
+from src.cache import LoadingCache, PRCache, details_from_snapshot
+from src.shards import load_snapshot
+
+
+def _details(url, state='MERGED', is_draft=False):
+    return {
+        'title': 't', 'url': url, 'number': 1, 'state': state, 'isDraft': is_draft,
+        'repository': {'nameWithOwner': 'o/r'}, 'createdAt': '2026-01-01T00:00:00Z',
+    }
+
+
+class TestPRCache(unittest.TestCase):
+    URL = 'https://github.com/O/R/pull/1'
+
+    def test_terminal_entries_never_expire(self):
+        now = [0]
+        cache = PRCache(ttl=10, clock=lambda: now[0])
+        cache.put(self.URL, _details(self.URL, 'MERGED'))
+        now[0] = 10 ** 9
+        self.assertIsNotNone(cache.get(self.URL))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 0, 'evictions': 0})
+
+    def test_open_entries_expire_after_ttl(self):
+        now = [0]
+        cache = PRCache(ttl=10, clock=lambda: now[0])
+        cache.put(self.URL, _details(self.URL, 'OPEN'))
+        now[0] = 5
+        self.assertIsNotNone(cache.get(self.URL))
+        now[0] = 11
+        self.assertIsNone(cache.get(self.URL))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 1})
+
+    def test_keys_are_canonical(self):
+        cache = PRCache()
+        cache.put(self.URL, _details(self.URL))
+        self.assertIsNotNone(cache.get('https://github.com/o/r/pull/1'))
+
+    def test_round_trips_through_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.json')
+            cache = PRCache.load(path)
+            cache.put(self.URL, _details(self.URL))
+            cache.save()
+            self.assertEqual(PRCache.load(path).get(self.URL)['title'], 't')
+
+
+class TestFetchUrlsWithCache(unittest.TestCase):
+    def test_cached_terminal_prs_are_not_refetched(self):
+        urls = ['https://github.com/o/r/pull/1', 'https://github.com/o/r/pull/2']
+        url_data = [
+            {'url': url, 'featured': False, 'featured_order': float('inf'), 'sheet_index': i}
+            for i, url in enumerate(urls)
+        ]
+        cache = PRCache()
+        cache.put(urls[0], _details(urls[0], 'MERGED'))
+        fetched = []
+
+        def fake_pr_details(url):
+            fetched.append(url)
+            return _details(url, 'OPEN')
+
+        repo_details = lambda repo: {'description': '', 'tech_stack': 'Python'}
+        with mock.patch.object(model, 'get_pr_details', fake_pr_details), \
+                mock.patch.object(model, 'get_repo_details', repo_details), \
+                contextlib.redirect_stdout(io.StringIO()):
+            model.fetch_urls(url_data, cache=cache)
+            model.fetch_urls(url_data, cache=cache)
+
+        self.assertEqual(fetched, [urls[1]])
+        self.assertEqual(cache.get(urls[1])['state'], 'OPEN')
+
+    def test_tech_stack_is_rederived_from_cached_repo_fields(self):
+        url = 'https://github.com/o/r/pull/1'
+        details = _details(url)
+        details['repo_node'] = {'description': '', 'primaryLanguage': {'name': 'Kotlin'},
+                                'repositoryTopics': {'nodes': [{'topic': {'name': 'compose'}}]}}
+        details['repo_info'] = {'description': '', 'tech_stack': 'Kotlin, Jetpack Compose'}
+        cache = PRCache()
+        cache.put(url, details)
+        self.assertNotIn('repo_info', cache.get(url))
+
+        url_data = [{'url': url, 'featured': False, 'featured_order': float('inf'), 'sheet_index': 0}]
+        with mock.patch.dict(model.TOPIC_MAP, {'compose': 'Compose'}), \
+                mock.patch.object(model, 'get_pr_details', side_effect=AssertionError), \
+                contextlib.redirect_stdout(io.StringIO()):
+            data, _ = model.fetch_urls(url_data, cache=cache)
+        pr, = [pr for months in data.values() for prs in months.values() for pr in prs]
+        self.assertEqual(pr.tech_stack, 'Kotlin, Compose')
+
+
+class TestIncrementalFromSnapshot(unittest.TestCase):
+    def test_terminal_prs_rebuilt_from_snapshot(self):
+        urls = ['https://github.com/O/R/pull/1', 'https://github.com/o/r/pull/2',
+                'https://github.com/o/x/pull/3']
+        states = {urls[0]: 'MERGED', urls[1]: 'OPEN', urls[2]: 'CLOSED'}
+        url_data = [
+            {'url': url, 'featured': i == 0, 'featured_order': 1.0, 'sheet_index': i}
+            for i, url in enumerate(urls)
+        ]
+        fetched = []
+
+        def fake_pr_details(url):
+            fetched.append(url)
+            details = _details(url, states[url])
+            details['number'] = int(url.rsplit('/', 1)[1])
+            details['createdAt'] = f"2026-01-0{details['number']}T00:00:00Z"
+            details['repository'] = {'nameWithOwner': '/'.join(url.split('/')[3:5])}
+            details['repo_node'] = {'description': '', 'primaryLanguage': {'name': 'Python'},
+                                    'repositoryTopics': {'nodes': []}}
+            return details
+
+        # Repo lookups are not patched out: any would reach this transport.
+        transport = mock.Mock(name='transport')
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(model, 'get_pr_details', fake_pr_details), \
+                mock.patch.object(github, 'transport', transport), \
+                mock.patch.object(github, 'repo_cache', LoadingCache()), \
+                contextlib.redirect_stdout(io.StringIO()):
+            full = model.fetch_urls(url_data)
+            path = os.path.join(tmp, 'README_DATA.json')
+            render.generate_json_snapshot(*full, output_file=path)
+
+            cache = PRCache(ttl=0)
+            cache.seed(details_from_snapshot(load_snapshot(path)))
+            fetched.clear()
+            incremental = model.fetch_urls(url_data, cache=cache)
+
+        self.assertEqual(fetched, [urls[1]])
+        transport.graphql.assert_not_called()
+        self.assertEqual(model.build_readme_model(*full), model.build_readme_model(*incremental))
+
+    def test_missing_snapshot(self):
+        self.assertIsNone(load_snapshot('/nonexistent/README_DATA.json'))
+
+
+class TestLoadingCache(unittest.TestCase):
+    def test_concurrent_loads_are_coalesced(self):
+        cache = LoadingCache()
+        release = threading.Event()
+        calls = []
+
+        def loader(key):
+            calls.append(key)
+            release.wait(5)
+            return key.upper()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load('o/r', loader, None)))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        while cache.stats()['coalesced'] < 3:
+            threading.Event().wait(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(calls, ['o/r'])
+        self.assertEqual(results, ['O/R'] * 4)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_failures_cached_for_negative_ttl(self):
+        now = [0]
+        cache = LoadingCache(negative_ttl=10, clock=lambda: now[0])
+        calls = []
+
+        def loader(key):
+            calls.append(key)
+            raise RuntimeError('gone')
+
+        fallback = lambda key, exc: {'error': str(exc)}
+        self.assertEqual(cache.get_or_load('o/r', loader, fallback), {'error': 'gone'})
+        self.assertEqual(cache.get_or_load('o/r', loader, fallback), {'error': 'gone'})
+        self.assertEqual(len(calls), 1)
+        now[0] = 10
+        cache.get_or_load('o/r', loader, fallback)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.stats()['failures'], 2)
+
+    def test_lru_eviction(self):
+        cache = LoadingCache(maxsize=2)
+        for key in ('a', 'b'):
+            cache.put(key, key)
+        cache.get_or_load('a', str.upper, None)  # touch "a"
+        cache.put('c', 'c')
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,167 @@
+"""Tests for applying pull_request webhook payloads to a snapshot (src.events, ``apply-event``)."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import cli, events, model, render, shards
+from src.cache import PRCache
+from helpers import grouped_mock, mock_pr
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _data(**changes):
+    """Sheet PRs, with ``changes`` (``number -> {field: value}``, None drops the PR) applied."""
+    prs = [
+        mock_pr("Fix crash on empty config", "https://github.com/octo/widgets/pull/12", 12, "OPEN",
+                "octo/widgets", "2026-01-20T08:00:00Z"),
+        mock_pr("other: speed up parser", "https://github.com/other/lib/pull/3", 3, "OPEN",
+                "other/lib", "2026-01-15T08:00:00Z"),
+        mock_pr("docs: install steps", "https://github.com/octo/widgets/pull/11", 11, "OPEN",
+                "octo/widgets", "2026-01-12T08:00:00Z"),
+        mock_pr("Add widget API", "https://github.com/octo/widgets/pull/10", 10, "MERGED",
+                "octo/widgets", "2026-01-05T08:00:00Z"),
+        mock_pr("Late 2025 Fix", "https://github.com/octo/widgets/pull/9", 9, "MERGED",
+                "octo/widgets", "2025-12-20T08:00:00Z"),
+    ]
+    patched = []
+    for pr in prs:
+        change = changes.get(f"pr{pr['number']}", {})
+        if change is None:
+            continue
+        pr = {**pr, **change}
+        pr['status'] = pr['state']
+        patched.append(pr)
+    return patched
+
+
+class TestApplyEvent(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.readme = os.path.join(tmp.name, 'README.md')
+        self.snapshot = os.path.join(tmp.name, 'README_DATA.json')
+        self.expected = (os.path.join(tmp.name, 'EXPECTED.md'), os.path.join(tmp.name, 'EXPECTED.json'))
+        self._render(_data(), (self.readme, self.snapshot))
+
+    def _render(self, prs, paths):
+        readme, snapshot = paths
+        m = model.build_readme_model(grouped_mock(prs)[0], {})
+        render.render_outputs(m, {readme: render.MarkdownSink(), snapshot: render.JsonSink()})
+
+    def _apply(self, fixture, *extra):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            code = cli.main(['apply-event', os.path.join(FIXTURES, fixture),
+                             '--snapshot', self.snapshot, '--output', self.readme, *extra])
+        self.assertEqual(code, 0)
+        return out.getvalue()
+
+    def assertMatchesFullRun(self, prs):
+        self._render(prs, self.expected)
+        for path, expected in zip((self.readme, self.snapshot), self.expected):
+            with open(path) as a, open(expected) as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_merged_event_matches_full_run(self):
+        out = self._apply('pull_request_closed_merged.json')
+        self.assertIn("OPEN -> MERGED", out)
+        self.assertMatchesFullRun(_data(pr12={'state': 'MERGED'}))
+
+    def test_title_edit_matches_full_run(self):
+        self._apply('pull_request_edited.json')
+        self.assertMatchesFullRun(_data(pr11={'title': "docs: clarify install steps"}))
+
+    def test_disallowed_status_removes_pr(self):
+        out = self._apply('pull_request_closed_unmerged.json', '--status', 'open', '--status', 'merged')
+        self.assertIn("not in allowed list", out)
+        self.assertMatchesFullRun(_data(pr12=None))
+
+    def test_unknown_pr_is_ignored(self):
+        with open(self.snapshot) as f:
+            before = f.read()
+        out = self._apply('pull_request_opened_unknown.json')
+        self.assertIn("not in the snapshot", out)
+        with open(self.snapshot) as f:
+            self.assertEqual(f.read(), before)
+
+    def test_snapshot_without_created_at_asks_for_full_run(self):
+        with open(self.snapshot) as f:
+            snapshot = json.load(f)
+        for year in snapshot['years']:
+            for month in year['months']:
+                for row in month['rows']:
+                    for item in row['contributions']:
+                        del item['created_at']
+        with open(self.snapshot, 'w') as f:
+            json.dump(snapshot, f)
+
+        self.assertIn("not in the snapshot", self._apply('pull_request_opened_unknown.json'))
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            code = cli.main(['apply-event', os.path.join(FIXTURES, 'pull_request_closed_merged.json'),
+                             '--snapshot', self.snapshot, '--output', self.readme])
+        self.assertEqual(code, 1)
+        self.assertIn("run a full update", out.getvalue())
+        with open(self.snapshot) as f:
+            self.assertEqual(json.load(f), snapshot)
+
+    def test_payload_from_stdin(self):
+        with open(os.path.join(FIXTURES, 'pull_request_closed_merged.json')) as f:
+            payload = f.read()
+        with mock.patch('sys.stdin', io.StringIO(payload)), contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(cli.main(['apply-event', '--snapshot', self.snapshot, '--output', self.readme]), 0)
+        self.assertMatchesFullRun(_data(pr12={'state': 'MERGED'}))
+
+    def test_shards_are_patched_too(self):
+        data_dir = os.path.join(os.path.dirname(self.snapshot), 'data')
+        manifest = os.path.join(data_dir, shards.MANIFEST_FILE)
+        previous = model.model_from_snapshot(shards.load_snapshot(self.snapshot))
+        shards.write_shards(previous, data_dir, 'ndjson')
+        with mock.patch.object(cli, 'SHARDS_DIR', data_dir):
+            self._apply('pull_request_closed_merged.json')
+        self.assertMatchesFullRun(_data(pr12={'state': 'MERGED'}))
+        self.assertEqual(shards.load_snapshot(manifest), shards.load_snapshot(self.snapshot))
+
+        # A manifest can be patched directly; README_DATA.json is kept in step with it.
+        data_file, self.snapshot = self.snapshot, manifest
+        with mock.patch.object(cli, 'SNAPSHOT_FILE', data_file):
+            self._apply('pull_request_edited.json')
+        self._render(_data(pr12={'state': 'MERGED'}, pr11={'title': "docs: clarify install steps"}),
+                     self.expected)
+        self.assertEqual(shards.load_snapshot(manifest), shards.load_snapshot(self.expected[1]))
+        self.assertEqual(shards.manifest_format(manifest), 'ndjson')
+        with open(data_file) as a, open(self.expected[1]) as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_pr_cache_entry_is_updated(self):
+        url = "https://github.com/octo/widgets/pull/12"
+        path = os.path.join(os.path.dirname(self.snapshot), 'pr_cache.json')
+        cache = PRCache.load(path)
+        entry = {**_data()[0], 'repo_node': {'description': '', 'primaryLanguage': {'name': 'Python'}}}
+        cache.put(url, entry)
+        cache.save()
+
+        self._apply('pull_request_closed_merged.json', '--cache', path)
+        cached = PRCache.load(path).get(url)
+        self.assertEqual(cached['state'], 'MERGED')
+        self.assertEqual(cached['repo_node'], entry['repo_node'])
+
+    def test_only_the_event_month_is_rebuilt(self):
+        with open(self.snapshot) as f:
+            snapshot = json.load(f)
+        with open(os.path.join(FIXTURES, 'pull_request_closed_merged.json')) as f:
+            payload = json.load(f)
+        with mock.patch.object(events, 'build_month_rows', wraps=events.build_month_rows) as build, \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(events.apply_event(snapshot, payload))
+            self.assertFalse(events.apply_event(snapshot, payload))
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(len(build.call_args.args[0]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,16 @@
 
 import contextlib
 import io
+import json
+import random
+import subprocess
+import time
 import unittest
+from unittest import mock
 
-from src import model
+from src import github, model, transport
+from src.cache import LoadingCache, PRCache
+from src.ratelimit import RateLimitedTransport
 
 
 class TestFetchUrlsFiltering(unittest.TestCase):
@@ -33,7 +40,321 @@ class TestFetchUrlsFiltering(unittest.TestCase):
             data, _ = model.fetch_urls(url_data, allowed_statuses={'OPEN'})
         rows = data[2026][(1, 'January')]
         self.assertEqual(len(rows), 1)
-        self.assertEqual(rows[0]['status'], 'OPEN')
+        self.assertEqual(rows[0].status, 'OPEN')
+
+
+class TestBatchedPrDetails(unittest.TestCase):
+    URLS = [
+        'https://github.com/o/r/pull/1',
+        'https://github.com/o/r/pull/2',
+        'https://github.com/x/y/pull/9',
+    ]
+
+    @staticmethod
+    def _node(num, url, state='MERGED'):
+        return {'title': f'PR {num}', 'url': url, 'state': state,
+                'createdAt': '2026-01-01T00:00:00Z', 'number': num, 'isDraft': False}
+
+    def test_aliases_batches_and_reports_per_pr_errors(self):
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            query = cmd[-1]
+            calls.append(query)
+            if 'pr1:' in query:
+                # Second PR in the first batch is missing -> partial error.
+                payload = {
+                    'data': {'pr0': {'nameWithOwner': 'O/r', 'description': 'desc',
+                                     'primaryLanguage': {'name': 'Kotlin'},
+                                     'repositoryTopics': {'nodes': [{'topic': {'name': 'compose'}}]},
+                                     'pullRequest': self._node(1, self.URLS[0])},
+                             'pr1': {'pullRequest': None}},
+                    'errors': [{'path': ['pr1', 'pullRequest'], 'message': 'not found'}],
+                }
+                raise subprocess.CalledProcessError(1, cmd, output=json.dumps(payload), stderr='gh: error')
+            payload = {'data': {'pr0': {'pullRequest': self._node(9, self.URLS[2], 'OPEN')}}}
+            return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(payload), stderr='')
+
+        out = io.StringIO()
+        with mock.patch.object(transport.subprocess, 'run', side_effect=fake_run), \
+                mock.patch.object(github, 'transport', transport.GhTransport()), \
+                mock.patch.object(github, 'repo_cache', LoadingCache()), \
+                contextlib.redirect_stdout(out):
+            results = github.get_pr_details_batch(self.URLS, batch_size=2)
+
+        self.assertEqual(len(calls), 2)
+        self.assertIn('pr0: repository(owner: "o", name: "r") {', calls[0])
+        self.assertIn('primaryLanguage { name }', calls[0])
+        self.assertIn('pullRequest(number: 1)', calls[0])
+        # Repo metadata arrives with the PR: canonical name + tech stack.
+        self.assertEqual(results[self.URLS[0]]['repository'], {'nameWithOwner': 'O/r'})
+        self.assertEqual(results[self.URLS[0]]['repo_info'],
+                         {'description': 'desc', 'tech_stack': 'Kotlin, Jetpack Compose'})
+        self.assertEqual(results[self.URLS[2]]['repository'], {'nameWithOwner': 'x/y'})
+        self.assertIsNone(results[self.URLS[1]])
+        self.assertEqual(results[self.URLS[2]]['state'], 'OPEN')
+        self.assertIn(f"Error fetching {self.URLS[1]}: not found", out.getvalue())
+
+    def test_per_pr_outcomes_track_retries_failures_and_gone_prs(self):
+        responses = [
+            subprocess.TimeoutExpired('gh', 5),
+            subprocess.CompletedProcess('gh', 0, stdout=json.dumps({'data': {
+                'pr0': {'pullRequest': self._node(1, self.URLS[0])}, 'pr1': {'pullRequest': None},
+            }}), stderr=''),
+            subprocess.CompletedProcess('gh', 0, stdout=json.dumps({'data': {
+                'pr0': {'pullRequest': self._node(9, self.URLS[2])},
+            }}), stderr=''),
+        ]
+
+        def fake_run(cmd, **kwargs):
+            self.assertEqual(kwargs['timeout'], 5)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        scheduler = RateLimitedTransport(transport.GhTransport(timeout=5), sleep=lambda _: None)
+        with mock.patch.object(transport.subprocess, 'run', side_effect=fake_run), \
+                mock.patch.object(github, 'transport', scheduler), \
+                mock.patch.object(github, 'repo_cache', LoadingCache()), \
+                mock.patch.dict(github.outcomes, clear=True), \
+                contextlib.redirect_stdout(io.StringIO()):
+            github.get_pr_details_batch(self.URLS, batch_size=2)
+            self.assertEqual(github.outcomes, {
+                self.URLS[0]: 'retried', self.URLS[1]: 'gone', self.URLS[2]: 'fetched',
+            })
+            self.assertEqual(github.outcome_summary(), {'fetched': 1, 'retried': 1, 'failed': 0, 'gone': 1})
+
+    def test_batched_fetch_matches_serial(self):
+        url_data = [
+            {'url': url, 'featured': i == 0, 'featured_order': float(i),
+             'sheet_index': i}
+            for i, url in enumerate(self.URLS)
+        ]
+
+        def fake_pr_details(url):
+            num = int(url.rsplit('/', 1)[1])
+            return github._attach_repository(self._node(num, url), url)
+
+        repo_details = lambda repo: {'description': '', 'tech_stack': 'Python'}
+        batch = lambda urls, size: {url: fake_pr_details(url) for url in urls}
+
+        with mock.patch.object(model, 'get_pr_details', fake_pr_details), \
+                mock.patch.object(model, 'get_pr_details_batch', batch), \
+                mock.patch.object(model, 'get_repo_details', repo_details), \
+                contextlib.redirect_stdout(io.StringIO()):
+            serial = model.fetch_urls(url_data)
+            batched = model.fetch_urls(url_data, batch_size=2)
+
+        self.assertEqual(model.build_readme_model(*serial), model.build_readme_model(*batched))
+
+
+class TestConcurrentFetch(unittest.TestCase):
+    def test_parallel_fetch_matches_serial_order(self):
+        url_data = [
+            {'url': f'https://github.com/o/r{i % 3}/pull/{i}', 'featured': i % 4 == 0,
+             'featured_order': float(10 - i), 'sheet_index': i}
+            for i in range(12)
+        ]
+
+        def fake_pr_details(url):
+            # Out-of-order completion must not change the merged result.
+            time.sleep(random.random() / 200)
+            num = int(url.rsplit('/', 1)[1])
+            return {
+                'title': f'PR {num}', 'url': url, 'number': num,
+                'state': 'MERGED', 'isDraft': False,
+                'repository': {'nameWithOwner': url.split('/')[3] + '/' + url.split('/')[4]},
+                'createdAt': '2026-01-01T00:00:00Z',
+            }
+
+        repo_details = lambda repo: {'description': '', 'tech_stack': 'Python'}
+        with mock.patch.object(model, 'get_pr_details', fake_pr_details), \
+                mock.patch.object(model, 'get_repo_details', repo_details), \
+                contextlib.redirect_stdout(io.StringIO()):
+            serial = model.fetch_urls(url_data)
+            parallel = model.fetch_urls(url_data, workers=8)
+
+        self.assertEqual(parallel[1], serial[1])
+        self.assertEqual(model.build_readme_model(*serial), model.build_readme_model(*parallel))
+
+
+class TestStreamingFetch(unittest.TestCase):
+    def test_url_data_is_consumed_one_window_at_a_time(self):
+        consumed = []
+
+        def rows():
+            for i in range(10):
+                consumed.append(i)
+                yield {'url': f'https://github.com/o/r/pull/{i}', 'featured': i == 7,
+                       'featured_order': 1.0, 'sheet_index': i}
+
+        def fake_batch(urls, batch_size):
+            return {url: {
+                'title': 'PR', 'url': url, 'number': int(url.rsplit('/', 1)[1]),
+                'state': 'MERGED', 'isDraft': False, 'createdAt': '2026-01-01T00:00:00Z',
+                'repository': {'nameWithOwner': 'o/r'}, 'repo_info': {'tech_stack': ''},
+            } for url in urls}
+
+        featured = {}
+        with mock.patch.object(model, 'get_pr_details_batch', fake_batch), \
+                contextlib.redirect_stdout(io.StringIO()):
+            records = model.iter_contributions(rows(), batch_size=2, workers=2, featured_repos=featured)
+            first = next(records)
+            self.assertEqual(consumed, [0, 1, 2, 3])
+            rest = list(records)
+
+        self.assertEqual([pr.number for pr in [first] + rest], list(range(10)))
+        self.assertEqual(featured, {'o/r': 1.0})
+
+
+class TestBudgetedFetch(unittest.TestCase):
+    @staticmethod
+    def _details(num, state, created, draft=False):
+        return {'title': f'PR {num}', 'url': f'https://github.com/o/r/pull/{num}', 'number': num,
+                'state': state, 'isDraft': draft, 'createdAt': created,
+                'repository': {'nameWithOwner': 'o/r'}, 'repo_info': {'tech_stack': ''}}
+
+    def test_volatile_prs_first_then_last_known_values(self):
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        known = {
+            1: self._details(1, 'MERGED', '2020-01-01T00:00:00Z'),
+            2: self._details(2, 'MERGED', now),
+            3: self._details(3, 'OPEN', '2021-01-01T00:00:00Z'),
+            4: self._details(4, 'OPEN', '2022-01-01T00:00:00Z', draft=True),
+        }
+        fallback = {d['url']: d for d in known.values()}
+        url_data = [{'url': f'https://github.com/o/r/pull/{n}', 'featured': False,
+                     'featured_order': float('inf'), 'sheet_index': n} for n in range(1, 6)]
+        clock = [0.0]
+        fetched = []
+
+        def fake_batch(urls, batch_size):
+            clock[0] += 10
+            fetched.extend(urls)
+            return {url: dict(known.get(int(url.rsplit('/', 1)[1]))
+                              or self._details(5, 'OPEN', '2023-01-01T00:00:00Z'), title='fresh')
+                    for url in urls}
+
+        stale = []
+        with mock.patch.object(model, 'get_pr_details_batch', fake_batch), \
+                contextlib.redirect_stdout(io.StringIO()):
+            data, _ = model.fetch_urls(url_data, batch_size=1, budget=35, fallback=fallback,
+                                       stale=stale, clock=lambda: clock[0])
+
+        # New PR, then OPEN/DRAFT (newest first); no time left for the MERGED ones.
+        self.assertEqual([int(url.rsplit('/', 1)[1]) for url in fetched], [5, 4, 3])
+        self.assertEqual(stale, [
+            {'url': 'https://github.com/o/r/pull/2', 'source': 'snapshot', 'reason': 'budget'},
+            {'url': 'https://github.com/o/r/pull/1', 'source': 'snapshot', 'reason': 'budget'},
+        ])
+        records = [pr for months in data.values() for prs in months.values() for pr in prs]
+        self.assertEqual(sorted((pr.number, pr.title) for pr in records), [
+            (1, 'PR 1'), (2, 'PR 2'), (3, 'fresh'), (4, 'fresh'), (5, 'fresh'),
+        ])
+
+    def test_failed_fetches_keep_last_known_details(self):
+        url_data = [{'url': f'https://github.com/o/r/pull/{n}', 'featured': False,
+                     'featured_order': float('inf'), 'sheet_index': n} for n in range(1, 4)]
+        fallback = {'https://github.com/O/R/pull/2': self._details(2, 'OPEN', '2024-01-01T00:00:00Z')}
+
+        def failing_batch(urls, batch_size):
+            # The whole batch failed after retries, except PR 1.
+            return {url: self._details(1, 'MERGED', '2024-01-01T00:00:00Z') if url.endswith('/1') else None
+                    for url in urls}
+
+        for budget in (None, 3600):
+            stale = []
+            with self.subTest(budget=budget), \
+                    mock.patch.object(model, 'get_pr_details_batch', failing_batch), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                data, _ = model.fetch_urls(url_data, batch_size=3, budget=budget, fallback=fallback,
+                                           stale=stale)
+                records = [pr for months in data.values() for prs in months.values() for pr in prs]
+                self.assertEqual(sorted((pr.number, pr.status) for pr in records),
+                                 [(1, 'MERGED'), (2, 'OPEN')])
+                self.assertEqual(sorted(stale, key=lambda item: item['url']), [
+                    {'url': 'https://github.com/o/r/pull/2', 'source': 'snapshot', 'reason': 'failed'},
+                    {'url': 'https://github.com/o/r/pull/3', 'source': 'missing', 'reason': 'failed'},
+                ])
+
+    def test_not_found_prs_are_dropped_not_kept_from_snapshot(self):
+        url_data = [{'url': f'https://github.com/o/r/pull/{n}', 'featured': False,
+                     'featured_order': float('inf'), 'sheet_index': n} for n in (1, 2)]
+        fallback = {d['url']: d for d in (self._details(n, 'OPEN', '2024-01-01T00:00:00Z') for n in (1, 2))}
+        payload = {
+            'data': {'pr0': {'pullRequest': None}, 'pr1': None},
+            'errors': [
+                {'type': 'NOT_FOUND', 'path': ['pr0', 'pullRequest'],
+                 'message': "Could not resolve to a PullRequest with the number of 1."},
+                {'type': 'RATE_LIMITED', 'path': ['pr1'], 'message': "API rate limit exceeded"},
+            ],
+        }
+
+        def fake_run(cmd, **kwargs):
+            raise subprocess.CalledProcessError(1, cmd, output=json.dumps(payload), stderr='gh: error')
+
+        stale = []
+        with mock.patch.object(transport.subprocess, 'run', side_effect=fake_run), \
+                mock.patch.object(github, 'transport', transport.GhTransport()), \
+                mock.patch.dict(github.outcomes, clear=True), \
+                contextlib.redirect_stdout(io.StringIO()) as out:
+            data, _ = model.fetch_urls(url_data, batch_size=2, fallback=fallback, stale=stale)
+
+        # Only the rate-limited PR falls back to its snapshot details.
+        records = [pr for months in data.values() for prs in months.values() for pr in prs]
+        self.assertEqual([pr.number for pr in records], [2])
+        self.assertEqual(stale, [
+            {'url': 'https://github.com/o/r/pull/2', 'source': 'snapshot', 'reason': 'failed'},
+        ])
+        self.assertIn("Warning: https://github.com/o/r/pull/1 no longer exists on GitHub", out.getvalue())
+
+    def test_last_known_details_need_no_unbudgeted_repo_lookup(self):
+        url = 'https://github.com/o/r/pull/1'
+        url_data = [{'url': url, 'featured': False, 'featured_order': float('inf'), 'sheet_index': 1}]
+        cached = self._details(1, 'MERGED', '2024-01-01T00:00:00Z')
+        del cached['repo_info']
+        cache = PRCache()
+        cache.put(url, cached)
+        deadlines = []
+
+        def repo_details(repo_name):
+            # Whatever lookup is left must run under the fetch deadline.
+            self.assertIsNotNone(deadlines[-1])
+            return {'description': '', 'tech_stack': 'Go'}
+
+        for fallback, tech_stack in (({url: self._details(1, 'MERGED', '2024-01-01T00:00:00Z')}, ''),
+                                     ({}, 'Go')):
+            ticks = iter(range(10))
+            with self.subTest(fallback=bool(fallback)), \
+                    mock.patch.object(model, 'get_pr_details_batch', side_effect=AssertionError), \
+                    mock.patch.object(model, 'get_repo_details', side_effect=repo_details) as lookup, \
+                    mock.patch.object(model, 'set_deadline', deadlines.append), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                data, _ = model.fetch_urls(url_data, batch_size=1, budget=0, cache=cache, fallback=fallback,
+                                           clock=lambda: next(ticks))
+                pr, = [pr for months in data.values() for prs in months.values() for pr in prs]
+                self.assertEqual(pr.tech_stack, tech_stack)
+                self.assertEqual(lookup.call_count, 0 if fallback else 1)
+                self.assertEqual(deadlines[-1], None)
+
+    def test_unlimited_budget_matches_unbudgeted_fetch(self):
+        url_data = [{'url': f'https://github.com/o/r/pull/{n}', 'featured': n == 2,
+                     'featured_order': 1.0, 'sheet_index': n} for n in range(1, 5)]
+
+        def fake_batch(urls, batch_size):
+            return {url: self._details(int(url.rsplit('/', 1)[1]), 'MERGED', '2024-01-01T00:00:00Z')
+                    for url in urls}
+
+        with mock.patch.object(model, 'get_pr_details_batch', fake_batch), \
+                mock.patch.object(model, 'set_deadline') as set_deadline, \
+                contextlib.redirect_stdout(io.StringIO()):
+            plain = model.fetch_urls(url_data, batch_size=2)
+            budgeted = model.fetch_urls(url_data, batch_size=2, budget=3600)
+        self.assertEqual(model.build_readme_model(*budgeted), model.build_readme_model(*plain))
+        # The transport gets the budget as its deadline, cleared afterwards.
+        self.assertEqual(set_deadline.call_args_list, [mock.call(3600), mock.call(None)])
+        self.assertEqual(budgeted[1], {'o/r': 1.0})
 
 
 if __name__ == "__main__":
@@ -1,8 +1,16 @@
 """Tests for model building and rendering consistency (src.model)."""
 
+import contextlib
+import copy
+import io
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
-from src import config, model
+from src import cli, columnar, config, model, render
+from src.cache import RenderMemo
 from helpers import SAMPLE_DATA, grouped_mock
 
 
@@ -58,7 +66,6 @@ class TestBuildModel(unittest.TestCase):
         model.get_pr_details = fake_pr_details
         model.get_repo_details = lambda repo: {'description': '', 'tech_stack': 'Python'}
 
-        import contextlib, io
         with contextlib.redirect_stdout(io.StringIO()):
             data, _ = model.fetch_urls(url_data)
         m = model.build_readme_model(data, {})
@@ -84,7 +91,6 @@ class TestBuildModel(unittest.TestCase):
         model.get_pr_details = fake_pr_details
         model.get_repo_details = lambda repo: {'description': '', 'tech_stack': 'Python'}
 
-        import contextlib, io
         with contextlib.redirect_stdout(io.StringIO()):
             data, _ = model.fetch_urls(url_data)
         m = model.build_readme_model(data, {})
@@ -100,6 +106,166 @@ class TestRenderConsistency(unittest.TestCase):
         self.assertEqual(md_prs, len(SAMPLE_DATA))
 
 
+class TestContributionRecord(unittest.TestCase):
+    def test_keys_computed_once_at_ingest(self):
+        pr = model.Contribution.from_details(SAMPLE_DATA[0])
+        self.assertEqual((pr.year, pr.month, pr.month_name), (2026, 1, 'January'))
+        self.assertEqual(pr.timestamp, 1768471200)
+        self.assertEqual((pr.repo_key, pr.status, pr.tech_stack), ('repo/a', 'OPEN', 'Python'))
+        self.assertFalse(hasattr(pr, '__dict__'))
+
+    def test_model_identical_for_records_and_raw_dicts(self):
+        data, featured = grouped_mock(SAMPLE_DATA)
+        records = {
+            year: {month: [model.Contribution.from_details(pr) for pr in prs] for month, prs in months.items()}
+            for year, months in data.items()
+        }
+        self.assertEqual(model.build_readme_model(records, featured), model.build_readme_model(data, featured))
+
+
+class TestNoOpDetection(unittest.TestCase):
+    def test_fingerprint_tracks_pr_fields_and_config(self):
+        data, featured = grouped_mock(SAMPLE_DATA)
+        base = model.run_fingerprint('sheet', data, featured)
+        self.assertEqual(base, model.run_fingerprint('sheet', *grouped_mock(copy.deepcopy(SAMPLE_DATA))))
+        self.assertNotEqual(base, model.run_fingerprint('other-sheet', data, featured))
+
+        renamed = copy.deepcopy(SAMPLE_DATA)
+        renamed[0]['title'] = 'Renamed'
+        self.assertNotEqual(base, model.run_fingerprint('sheet', *grouped_mock(renamed)))
+
+        with mock.patch.dict(model.STATUS_ICONS, {'OPEN': 'x'}):
+            self.assertNotEqual(base, model.run_fingerprint('sheet', data, featured))
+
+    def test_outputs_only_rewritten_when_bytes_change(self):
+        data, featured = grouped_mock(SAMPLE_DATA)
+        with tempfile.TemporaryDirectory() as tmp:
+            md = os.path.join(tmp, 'README.md')
+            js = os.path.join(tmp, 'README_DATA.json')
+            self.assertTrue(render.generate_markdown(data, featured, output_file=md))
+            self.assertTrue(render.generate_json_snapshot(data, featured, output_file=js))
+            self.assertFalse(render.generate_markdown(data, featured, output_file=md))
+            self.assertFalse(render.generate_json_snapshot(data, featured, output_file=js))
+            self.assertEqual(sorted(os.listdir(tmp)), ['README.md', 'README_DATA.json'])
+
+
+class TestRenderSinks(unittest.TestCase):
+    def _render(self, data, featured):
+        m = model.build_readme_model(data, featured)
+        return render.render_model(m, [render.MarkdownSink(), render.JsonSink()])
+
+    def test_json_sink_matches_json_dump(self):
+        data, _ = grouped_mock(SAMPLE_DATA)
+        featured = {'repo/a': 1.0, 'repo/b': float('inf')}
+        _, json_sink = self._render(data, featured)
+        text = json_sink.getvalue()
+        expected = json.dumps(json.loads(text), indent=2, ensure_ascii=False) + "\n"
+        self.assertEqual(text, expected)
+        self.assertEqual(len(json.loads(text)['years']), 3)
+
+    def test_empty_model(self):
+        md_sink, json_sink = self._render({}, {})
+        self.assertEqual(json.loads(json_sink.getvalue())['years'], [])
+        self.assertIn('"years": []', json_sink.getvalue())
+        self.assertTrue(md_sink.getvalue().startswith("# OSS Contributions\n\n## Status"))
+
+
+class TestRenderMemo(unittest.TestCase):
+    @staticmethod
+    def _outputs(data, featured, memo=None):
+        m = model.build_readme_model(data, featured, memo=memo)
+        return [sink.getvalue() for sink in render.render_model(m, [render.MarkdownSink(), render.JsonSink()], memo)]
+
+    def test_only_changed_month_is_rebuilt(self):
+        data, featured = grouped_mock(SAMPLE_DATA)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'memo.json')
+            memo = RenderMemo.load(path)
+            self.assertEqual(self._outputs(data, featured, memo), self._outputs(data, featured))
+            memo.save()
+
+            changed = copy.deepcopy(SAMPLE_DATA)
+            changed[-1]['title'] = 'feat: finished draft'
+            data, featured = grouped_mock(changed)
+            memo = RenderMemo.load(path)
+            self.assertEqual(self._outputs(data, featured, memo), self._outputs(data, featured))
+
+        # 2026-01, 2025-12 and 2025-06 reused; only the 2024-01 month changed.
+        self.assertEqual(memo.stats(), {'hits': 3, 'misses': 1})
+
+
+class TestColumnarGrouping(unittest.TestCase):
+    @staticmethod
+    def _records(n=400):
+        # Few repos/timestamps so ties on every sort key are exercised.
+        return [
+            model.Contribution(
+                number=i, title=f"fix: thing {i}", url=f"https://github.com/o/r/pull/{i}",
+                created_at=f"202{i % 3}-0{1 + i % 2}-0{1 + i % 3}T00:00:00Z",
+                status=['MERGED', 'OPEN', 'closed'][i % 3 % 2],
+                repo_name=['Org/Repo', 'org/repo', 'o/a', 'z/z'][i % 4],
+                tech_stack=f"stack{i % 4}", sheet_index=i // 5,
+            )
+            for i in range(n)
+        ]
+
+    def _grouped(self):
+        data = {}
+        for pr in self._records():
+            data.setdefault(pr.year, {}).setdefault((pr.month, pr.month_name), []).append(pr)
+        return data
+
+    def test_matches_python_builder(self):
+        data = self._grouped()
+        self.assertEqual(model.build_readme_model(data, {}, backend="columnar"),
+                         model.build_readme_model(data, {}))
+
+    def test_stdlib_fallback_matches_python_builder(self):
+        data = self._grouped()
+        with mock.patch.object(columnar, 'np', None):
+            self.assertEqual(model.build_readme_model(data, {}, backend="columnar"),
+                             model.build_readme_model(data, {}))
+
+    def test_memo_misses_are_built_together(self):
+        data = self._grouped()
+        memo = RenderMemo()
+        with mock.patch.object(columnar, 'group_months', wraps=columnar.group_months) as group:
+            first = model.build_readme_model(data, {}, memo=memo, backend="columnar")
+            second = model.build_readme_model(data, {}, memo=memo, backend="columnar")
+        self.assertEqual(first, second)
+        self.assertEqual(group.call_count, 2)
+        self.assertEqual(len(group.call_args_list[0].args[0]), memo.stats()['misses'])
+        self.assertEqual(group.call_args_list[1].args[0], [])
+
+
+class TestOfflineRerender(unittest.TestCase):
+    def test_round_trip_matches_live_render(self):
+        data, _ = grouped_mock(SAMPLE_DATA)
+        featured = {'repo/a': 1.0, 'repo/c': float('inf')}
+        with tempfile.TemporaryDirectory() as tmp:
+            live_md = os.path.join(tmp, 'README.md')
+            snapshot = os.path.join(tmp, 'README_DATA.json')
+            offline_md = os.path.join(tmp, 'OFFLINE.md')
+            live = model.build_readme_model(data, featured)
+            render.render_outputs(live, {live_md: render.MarkdownSink(), snapshot: render.JsonSink()})
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(cli.main(['render', '--snapshot', snapshot, '--output', offline_md]), 0)
+
+            with open(live_md) as a, open(offline_md) as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_config_changes_apply_offline(self):
+        data, featured = grouped_mock(SAMPLE_DATA)
+        m = model.build_readme_model(data, featured)
+        snapshot = json.loads(render.render_model(m, [render.JsonSink()])[0].getvalue())
+        with mock.patch.dict(model.STATUS_ICONS, {'MERGED': 'M'}):
+            rehydrated = model.model_from_snapshot(snapshot)
+        icons = {row['status']: row['status_icon'] for y in rehydrated['years']
+                 for mo in y['months'] for row in mo['rows']}
+        self.assertEqual(icons['MERGED'], 'M')
+
+
 class TestBuildModelFeatured(unittest.TestCase):
     def test_featured_projects_sorted_by_order(self):
         url_data = [
@@ -115,7 +281,6 @@ class TestBuildModelFeatured(unittest.TestCase):
         }
         model.get_repo_details = lambda repo: {'description': '', 'tech_stack': 'Python'}
 
-        import contextlib, io
         with contextlib.redirect_stdout(io.StringIO()):
             data, featured = model.fetch_urls(url_data)
         m = model.build_readme_model(data, featured)
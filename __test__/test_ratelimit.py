@@ -0,0 +1,164 @@
+"""Tests for the rate-limit scheduler (src.ratelimit)."""
+
+import contextlib
+import io
+import threading
+import unittest
+
+from src.ratelimit import HedgedTransport, RateLimitedTransport
+from src.transport import TransportError, TransportTimeout
+
+
+class ScriptedTransport:
+    """Returns (or raises) the queued results in order."""
+
+    name = "scripted"
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+        self.timeouts = []
+
+    def graphql(self, query, timeout=None):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _payload(remaining, reset_at="1970-01-01T01:00:00Z"):
+    return {'data': {'rateLimit': {'remaining': remaining, 'resetAt': reset_at}}}
+
+
+class TestRateLimitedTransport(unittest.TestCase):
+    def _scheduler(self, inner, now=0):
+        self.sleeps = []
+        self.now = [now]
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now[0] += seconds
+
+        return RateLimitedTransport(inner, reserve=10, max_retries=2, base_delay=1.0,
+                                    sleep=sleep, clock=lambda: self.now[0], rng=lambda: 1.0)
+
+    def test_throttles_until_reset_when_budget_low(self):
+        scheduler = self._scheduler(ScriptedTransport(_payload(5), _payload(4999)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.graphql('q')
+            scheduler.graphql('q')
+        self.assertEqual(self.sleeps, [3600])
+        self.assertEqual(scheduler.stats()['throttled'], 1)
+
+    def test_retries_5xx_with_exponential_backoff(self):
+        inner = ScriptedTransport(TransportError('bad gateway', status=502),
+                                  TransportError('You have exceeded a secondary rate limit'),
+                                  _payload(100))
+        scheduler = self._scheduler(inner)
+        self.assertEqual(scheduler.graphql('q'), _payload(100))
+        self.assertEqual(self.sleeps, [1.0, 2.0])
+        self.assertEqual(scheduler.stats()['retries'], 2)
+
+    def test_timeouts_are_retried_and_attempts_reported(self):
+        scheduler = self._scheduler(ScriptedTransport(TransportTimeout('gh timed out'), _payload(100)))
+        self.assertEqual(scheduler.graphql('q'), _payload(100))
+        self.assertEqual(scheduler.last_attempts(), 2)
+        scheduler.inner.results.append(_payload(99))
+        scheduler.graphql('q')
+        self.assertEqual(scheduler.last_attempts(), 1)
+
+    def test_honours_retry_after(self):
+        inner = ScriptedTransport(TransportError('slow down', status=429, retry_after=7), _payload(100))
+        scheduler = self._scheduler(inner)
+        scheduler.graphql('q')
+        self.assertEqual(self.sleeps, [7])
+
+    def test_deadline_caps_call_timeouts_and_retries(self):
+        test = self
+
+        class Slow(ScriptedTransport):
+            def graphql(self, query, timeout=None):
+                test.now[0] += 4
+                return super().graphql(query, timeout)
+
+        scheduler = self._scheduler(Slow(*[TransportTimeout('timed out')] * 3))
+        scheduler.set_deadline(10)
+        with self.assertRaises(TransportTimeout):
+            scheduler.graphql('q')
+        # 4s call, 1s backoff, then a call capped at the 5s left; the next 2s backoff would overrun.
+        self.assertEqual(scheduler.inner.timeouts, [10, 5])
+        self.assertEqual(self.sleeps, [1.0])
+        self.assertLess(self.now[0], 10)
+
+    def test_deadline_skips_rate_limit_wait(self):
+        scheduler = self._scheduler(ScriptedTransport(_payload(5), _payload(4999)))
+        scheduler.set_deadline(60)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.graphql('q')
+            scheduler.graphql('q')
+        self.assertEqual(self.sleeps, [])
+        scheduler.set_deadline(None)
+        self.assertIsNone(scheduler.deadline)
+
+    def test_non_retryable_errors_raise_immediately(self):
+        inner = ScriptedTransport(TransportError('bad credentials', status=401))
+        scheduler = self._scheduler(inner)
+        with self.assertRaises(TransportError):
+            scheduler.graphql('q')
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(scheduler.stats()['failures'], 1)
+
+    def test_gives_up_after_max_retries(self):
+        inner = ScriptedTransport(*[TransportError('boom', status=503)] * 3)
+        scheduler = self._scheduler(inner)
+        with self.assertRaises(TransportError):
+            scheduler.graphql('q')
+        self.assertEqual(inner.calls, 3)
+
+    def test_graphql_rate_limited_error_waits_for_reset(self):
+        limited = {'data': {'rateLimit': {'remaining': 0, 'resetAt': "1970-01-01T00:00:30Z"}},
+                   'errors': [{'type': 'RATE_LIMITED', 'message': 'API rate limit exceeded'}]}
+        scheduler = self._scheduler(ScriptedTransport(limited, _payload(5000)))
+        self.assertEqual(scheduler.graphql('q'), _payload(5000))
+        self.assertEqual(self.sleeps, [30])
+
+
+class TestHedgedTransport(unittest.TestCase):
+    def test_no_hedging_until_enough_samples(self):
+        hedger = HedgedTransport(ScriptedTransport(*[_payload(1)] * 3), min_samples=3)
+        for _ in range(3):
+            self.assertIsNone(hedger.hedge_delay())
+            hedger.graphql('q')
+        self.assertIsNotNone(hedger.hedge_delay())
+        self.assertEqual(hedger.stats()['hedged'], 0)
+        hedger.close()
+
+    def test_slow_call_is_hedged_and_first_response_wins(self):
+        release = threading.Event()
+
+        class Inner:
+            name = "slow-once"
+            calls = 0
+
+            def graphql(self, query):
+                Inner.calls += 1
+                if Inner.calls == 1:
+                    release.wait(5)
+                    return {'data': 'slow'}
+                return {'data': 'fast'}
+
+        hedger = HedgedTransport(Inner(), quantile=0.5, min_samples=1)
+        hedger._latencies.append(0.01)
+        try:
+            self.assertEqual(hedger.graphql('q'), {'data': 'fast'})
+            self.assertEqual(hedger.stats()['hedged'], 1)
+            self.assertEqual(hedger.stats()['hedge_wins'], 1)
+        finally:
+            release.set()
+            hedger.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,68 @@
+"""Tests for the per-year sharded snapshot layout (src.shards)."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import model, render, shards
+from helpers import SAMPLE_DATA, grouped_mock
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        data, _ = grouped_mock(SAMPLE_DATA)
+        self.model = model.build_readme_model(data, {})
+        sink, = render.render_model(self.model, [render.JsonSink()])
+        self.snapshot = json.loads(sink.getvalue())
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = os.path.join(self.tmp.name, 'data')
+        self.manifest = os.path.join(self.directory, shards.MANIFEST_FILE)
+
+    def test_every_format_round_trips(self):
+        for fmt in shards.SHARD_FORMATS:
+            with self.subTest(fmt=fmt):
+                shards.write_shards(self.model, self.directory, fmt)
+                self.assertEqual(shards.load_snapshot(self.manifest), self.snapshot)
+
+    def test_gzip_shards_are_reproducible(self):
+        year_doc = self.snapshot['years'][0]
+        self.assertEqual(shards.encode_shard(year_doc, 'ndjson.gz'), shards.encode_shard(year_doc, 'ndjson.gz'))
+
+    def test_unchanged_model_rewrites_nothing(self):
+        written = shards.write_shards(self.model, self.directory)
+        self.assertEqual(len(written), len(self.snapshot['years']) + 1)
+        self.assertEqual(shards.write_shards(self.model, self.directory), [])
+
+    def test_year_filter_reads_only_that_shard(self):
+        shards.write_shards(self.model, self.directory, 'min')
+        real_open = open
+        opened = []
+
+        def tracking_open(path, *args, **kwargs):
+            opened.append(os.path.basename(path))
+            return real_open(path, *args, **kwargs)
+
+        with mock.patch('builtins.open', tracking_open):
+            snapshot = shards.load_snapshot(self.manifest, years=[2025])
+        self.assertEqual([year['year'] for year in snapshot['years']], [2025])
+        self.assertEqual(opened, [shards.MANIFEST_FILE, shards.MANIFEST_FILE, "2025.min.json"])
+
+    def test_tampered_shard_is_rejected(self):
+        shards.write_shards(self.model, self.directory)
+        with open(os.path.join(self.directory, "2025.json"), "a") as f:
+            f.write(" ")
+        with self.assertRaises(ValueError):
+            shards.load_shards(self.manifest)
+
+    def test_stale_shards_are_pruned(self):
+        shards.write_shards(self.model, self.directory)
+        shards.write_shards(self.model, self.directory, 'ndjson.gz')
+        expected = [f"{year['year']}.ndjson.gz" for year in self.snapshot['years']] + [shards.MANIFEST_FILE]
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,15 @@
 """Tests for Google Sheet CSV parsing (src.sheet)."""
 
+import contextlib
 import csv
 import io
+import os
+import tempfile
 import unittest
+from unittest import mock
 
-from src import sheet
+from src import model, sheet
+from helpers import StubServer
 
 
 class TestSheetParsing(unittest.TestCase):
@@ -33,6 +38,53 @@ class TestSheetParsing(unittest.TestCase):
         self.assertEqual(featured[0]['url'], "https://github.com/o/r/pull/1")
 
 
+class TestSheetDedup(unittest.TestCase):
+    CSV = (
+        "PR,Featured,FeaturedOrder\n"
+        "https://github.com/Owner/Repo/pull/7/files,,\n"
+        "https://github.com/o/r/pull/1,,\n"
+        "https://github.com/owner/repo/pull/7#issuecomment-123,YES,5\n"
+        "https://GitHub.com/OWNER/repo/pull/7/commits?w=1,YES,3\n"
+        "https://github.com/o/r/pull/abc,,\n"
+    )
+
+    def test_variants_of_one_pr_are_merged(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            url_data, _ = sheet._parse_sheet(csv.DictReader(io.StringIO(self.CSV)))
+        self.assertEqual(url_data, [
+            {'url': "https://github.com/Owner/Repo/pull/7", 'featured': True,
+             'featured_order': 3.0, 'sheet_index': 0},
+            {'url': "https://github.com/o/r/pull/1", 'featured': False,
+             'featured_order': float('inf'), 'sheet_index': 1},
+        ])
+        self.assertEqual(out.getvalue().count("Merging duplicate PR"), 2)
+        self.assertIn("Skipping invalid URL at row 6", out.getvalue())
+
+    def test_non_featured_rows_do_not_set_the_order(self):
+        csv_content = (
+            "PR,Featured,FeaturedOrder\n"
+            "https://github.com/o/r/pull/1,,1\n"
+            "https://github.com/o/r/pull/1/files,YES,4\n"
+            "https://github.com/o/r/pull/1/commits,NO,2\n"
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            url_data, _ = sheet._parse_sheet(csv.DictReader(io.StringIO(csv_content)))
+        self.assertEqual([(e['featured'], e['featured_order']) for e in url_data], [(True, 4.0)])
+
+    def test_each_pr_is_fetched_once(self):
+        fetched = []
+
+        def fake_batch(urls, batch_size):
+            fetched.extend(urls)
+            return {url: None for url in urls}
+
+        with contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch.object(model, 'get_pr_details_batch', fake_batch):
+            url_data, _ = sheet._parse_sheet(csv.DictReader(io.StringIO(self.CSV)))
+            model.fetch_urls(url_data, batch_size=50)
+        self.assertEqual(fetched, ["https://github.com/Owner/Repo/pull/7", "https://github.com/o/r/pull/1"])
+
+
 class TestAllowedStatuses(unittest.TestCase):
     def test_parses_values(self):
         csv_content = "Status,Value\nOPEN,1\nCLOSED,0\nMERGED,1\n"
@@ -40,5 +92,36 @@ class TestAllowedStatuses(unittest.TestCase):
         self.assertEqual(result, {'OPEN', 'MERGED'})
 
 
+class TestFetchSheet(unittest.TestCase):
+    CSV = "Status,Value,PR\nOPEN,1,https://github.com/o/r/pull/1\n"
+
+    def test_conditional_request_reuses_previous_rows(self):
+        def respond(method, path, headers, body):
+            if headers.get('If-None-Match') == '"v1"':
+                return 304, {}, b''
+            return 200, {'ETag': '"v1"', 'Content-Type': 'text/csv'}, self.CSV
+
+        with tempfile.TemporaryDirectory() as tmp, StubServer(respond) as server:
+            state = os.path.join(tmp, 'sheet.json')
+            first = sheet.fetch_sheet(server.url + '/csv', state)
+            second = sheet.fetch_sheet(server.url + '/csv', state)
+
+        self.assertFalse(first['unchanged'])
+        self.assertTrue(second['unchanged'])
+        self.assertEqual(second['url_data'], first['url_data'])
+        self.assertEqual(second['allowed'], {'OPEN'})
+        self.assertEqual(second['sha256'], first['sha256'])
+
+    def test_content_hash_detects_unchanged_sheet(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                StubServer(lambda *args: (200, {}, self.CSV)) as server:
+            state = os.path.join(tmp, 'sheet.json')
+            self.assertFalse(sheet.fetch_sheet(server.url, state)['unchanged'])
+            result = sheet.fetch_sheet(server.url, state)
+
+        self.assertTrue(result['unchanged'])
+        self.assertEqual(result['url_data'][0]['url'], 'https://github.com/o/r/pull/1')
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
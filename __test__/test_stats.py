@@ -0,0 +1,52 @@
+"""Tests for the aggregate stats index (src.stats)."""
+
+import json
+import unittest
+
+from src import model, render
+from src.stats import StatsIndex, build_index
+from helpers import SAMPLE_DATA, grouped_mock
+
+
+class TestStatsIndex(unittest.TestCase):
+    def setUp(self):
+        data, _ = grouped_mock(SAMPLE_DATA)
+        self.model = model.build_readme_model(data, {})
+        self.index = StatsIndex(build_index(self.model))
+
+    def test_counts(self):
+        stats = self.index
+        self.assertEqual(stats.total(), 6)
+        self.assertEqual(stats.total('merged'), 2)
+        self.assertEqual(stats.repo('Repo/A'), 3)
+        self.assertEqual(stats.repo('repo/a', 'MERGED', year=2025), 1)
+        self.assertEqual(stats.repo('repo/a', 'MERGED', year=2026), 1)
+        self.assertEqual(stats.year(2026), 3)
+        self.assertEqual(stats.month(2024, 1, 'DRAFT'), 1)
+        self.assertEqual(stats.tech('Python', 'OPEN'), 2)
+        self.assertEqual(stats.tech('Rust'), 0)
+        self.assertEqual(stats.repo('nobody/nothing', year=1999), 0)
+        self.assertEqual(stats.top_repos(2), [('repo/a', 3), ('repo/b', 1)])
+
+    def test_snapshot_carries_index(self):
+        sink, = render.render_model(self.model, [render.JsonSink()])
+        snapshot = json.loads(sink.getvalue())
+        self.assertEqual(snapshot['stats'], self.index.index)
+        self.assertEqual(StatsIndex.from_snapshot(snapshot).total(), 6)
+
+        del snapshot['stats']
+        self.assertEqual(StatsIndex.from_snapshot(snapshot).index, self.index.index)
+
+    def test_markdown_stats_section_is_optional(self):
+        plain, with_stats = render.render_model(
+            self.model, [render.MarkdownSink(), render.MarkdownSink(stats=True)]
+        )
+        self.assertNotIn("## Stats", plain.getvalue())
+        section = with_stats.getvalue().split("## Stats\n\n", 1)[1].split("## Status", 1)[0]
+        self.assertIn("**6** contributions to **4** repositories.", section)
+        self.assertIn("| [repo/a](https://github.com/repo/a) | 3 |", section)
+        self.assertIn("| Python | 6 |", section)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for span tracing (src.tracing) and the ``--trace`` instrumentation."""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from src import github, tracing, transport
+from src.cache import LoadingCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.5
+        return self.now
+
+
+class TestTracer(unittest.TestCase):
+    def test_spans_nest_and_record_args(self):
+        tracer = tracing.Tracer(clock=FakeClock())
+        with tracer.span("outer", answer=42):
+            with tracer.span("inner", "github"):
+                tracer.annotate(exit_code=1)
+            tracer.annotate(rows=3)
+
+        inner, outer = tracer.events
+        self.assertEqual((inner['name'], inner['cat'], inner['ph']), ("inner", "github", "X"))
+        self.assertEqual(inner['args'], {'exit_code': 1})
+        self.assertEqual(outer['args'], {'answer': 42, 'rows': 3})
+        self.assertEqual(outer['ts'], 0.5e6)
+        self.assertEqual(outer['dur'], 1.5e6)
+        self.assertEqual(inner['dur'], 0.5e6)
+
+    def test_error_is_recorded_and_reraised(self):
+        tracer = tracing.Tracer(clock=FakeClock())
+        with self.assertRaises(ValueError):
+            with tracer.span("boom"):
+                raise ValueError("bad")
+        self.assertEqual(tracer.events[0]['args']['error'], "ValueError: bad")
+
+    def test_write_produces_chrome_trace_json(self):
+        tracer = tracing.Tracer()
+        for name in ("b", "a"):
+            with tracer.span(name, "github"):
+                pass
+        self.assertEqual(tracer.slowest("github", 1), [max(tracer.events, key=lambda e: e['dur'])])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracer.write(path)
+            with open(path) as f:
+                trace = json.load(f)
+        self.assertEqual(trace['displayTimeUnit'], 'ms')
+        self.assertEqual([e['name'] for e in trace['traceEvents']], ["b", "a"])
+
+
+class TestGithubSpans(unittest.TestCase):
+    def setUp(self):
+        self.tracer = tracing.Tracer()
+        tracing.set_tracer(self.tracer)
+        self.addCleanup(tracing.set_tracer, tracing.NullTracer())
+        self.addCleanup(github.set_transport, github.transport)
+        self.addCleanup(setattr, github, 'repo_cache', github.repo_cache)
+        github.set_transport(transport.GhTransport())
+        github.repo_cache = LoadingCache()
+
+    def test_batch_span_carries_urls_and_exit_code(self):
+        url = 'https://github.com/o/r/pull/1'
+
+        def fake_run(cmd, **kwargs):
+            raise subprocess.CalledProcessError(1, cmd, output="", stderr="HTTP 502: Bad Gateway")
+
+        with mock.patch.object(transport.subprocess, 'run', fake_run), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(github.get_pr_details(url))
+
+        event, = self.tracer.events
+        self.assertEqual(event['cat'], "github")
+        self.assertEqual(event['args']['urls'], [url])
+        self.assertEqual(event['args']['exit_code'], 1)
+        self.assertIn('error', event['args'])
+
+
+if __name__ == '__main__':
+    unittest.main()
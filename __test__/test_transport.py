@@ -0,0 +1,101 @@
+"""Tests for the HTTP transport (src.transport) against a local stub server."""
+
+import contextlib
+import io
+import json
+import subprocess
+import time
+import unittest
+from unittest import mock
+
+from src import github, transport
+from src.cache import LoadingCache
+from helpers import StubServer
+
+
+def _graphql_response(method, path, headers, body):
+    query = json.loads(body)['query']
+    data = {}
+    if 'pr0:' in query:
+        data['pr0'] = {
+            'nameWithOwner': 'o/r', 'description': 'd', 'primaryLanguage': {'name': 'Rust'},
+            'repositoryTopics': {'nodes': []},
+            'pullRequest': {'title': 'feat: x', 'url': 'https://github.com/o/r/pull/1',
+                            'state': 'MERGED', 'createdAt': '2026-01-01T00:00:00Z',
+                            'number': 1, 'isDraft': False},
+        }
+    return 200, {'Content-Type': 'application/json'}, json.dumps({'data': data})
+
+
+class TestHttpTransport(unittest.TestCase):
+    def test_reuses_keep_alive_connection_and_sends_token(self):
+        with StubServer(_graphql_response) as server:
+            client = transport.HttpTransport(token='secret', base_url=server.url)
+            for _ in range(3):
+                client.graphql('query { pr0: viewer { login } }')
+            client.close()
+
+        self.assertEqual(client.pool.created, 1)
+        self.assertEqual(len({port for *_, port in server.requests}), 1)
+        method, path, headers, _, _ = server.requests[0]
+        self.assertEqual((method, path), ('POST', '/graphql'))
+        self.assertEqual(headers['Authorization'], 'bearer secret')
+
+    def test_http_errors_raise_transport_error(self):
+        with StubServer(lambda *args: (502, {}, 'bad gateway')) as server:
+            client = transport.HttpTransport(token='t', base_url=server.url)
+            self.addCleanup(client.close)
+            with self.assertRaises(transport.TransportError) as ctx:
+                client.graphql('query { x }')
+        self.assertEqual(ctx.exception.status, 502)
+
+    def test_slow_response_raises_timeout(self):
+        def slow(*args):
+            time.sleep(0.5)
+            return _graphql_response(*args)
+
+        with StubServer(slow) as server:
+            client = transport.HttpTransport(token='t', base_url=server.url, timeout=0.1)
+            with self.assertRaises(transport.TransportTimeout):
+                client.graphql('query { x }')
+            client.close()
+
+    def test_requires_token(self):
+        with mock.patch.dict('os.environ', {}, clear=True):
+            with self.assertRaises(transport.TransportError):
+                transport.HttpTransport()
+
+    def test_pr_batch_over_http(self):
+        url = 'https://github.com/o/r/pull/1'
+        with StubServer(_graphql_response) as server, \
+                mock.patch.object(github, 'repo_cache', LoadingCache()), \
+                contextlib.redirect_stdout(io.StringIO()):
+            client = transport.HttpTransport(token='t', base_url=server.url)
+            github.set_transport(client)
+            try:
+                details = github.get_pr_details(url)
+                repo = github.get_repo_details('o/r')
+            finally:
+                client.close()
+                github.set_transport(transport.GhTransport())
+
+        self.assertEqual(details['title'], 'feat: x')
+        self.assertEqual(details['repo_info']['tech_stack'], 'Rust')
+        # Repo metadata came with the PR; no second request was made.
+        self.assertEqual(repo, details['repo_info'])
+        self.assertEqual(len(server.requests), 1)
+
+
+class TestGhTransport(unittest.TestCase):
+    def test_hung_gh_is_killed_after_timeout(self):
+        def fake_run(cmd, **kwargs):
+            raise subprocess.TimeoutExpired(cmd, kwargs['timeout'])
+
+        with mock.patch.object(transport.subprocess, 'run', fake_run):
+            with self.assertRaises(transport.TransportTimeout) as ctx:
+                transport.GhTransport(timeout=2).graphql('query { x }')
+        self.assertIn("timed out after 2s", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,237 @@
+"""Synthetic-scale benchmark for the README pipeline.
+
+Generates a sheet with N PR rows, serves it from a local HTTP stub, answers
+GitHub GraphQL queries from a fake transport (or a fake ``gh`` executable)
+with configurable latency, and times each stage separately:
+
+    sheet      fetch + ``_parse_sheet``
+    fetch      ``fetch_urls``
+    model      ``build_readme_model``
+    markdown   Markdown sink
+    json       JSON snapshot sink
+
+Results are written as JSON so runs can be compared between commits::
+
+    python bench/bench_pipeline.py --sizes 1000 10000 --latency 0.05 --output bench_results.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import github, model, render, sheet  # noqa: E402
+from src.cache import LoadingCache  # noqa: E402
+from src.config import PR_BATCH_SIZE  # noqa: E402
+from src.transport import GhTransport  # noqa: E402
+
+ALIAS_RE = re.compile(
+    r'(pr\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\) \{.*?pullRequest\(number: (\d+)\)'
+)
+TITLES = ["feat: add {}", "fix(core): handle {}", "Update {}", "refactor: split {}", "misc {}"]
+STATES = ["MERGED", "MERGED", "MERGED", "OPEN", "CLOSED"]
+
+
+def make_sheet(rows, repos):
+    """CSV text for ``rows`` PR rows spread over ``repos`` repositories."""
+    lines = ["Status,Value,PR,Featured,FeaturedOrder", "OPEN,1,,,", "MERGED,1,,,", "DRAFT,1,,,"]
+    for i in range(rows):
+        featured = "YES" if i % 500 == 0 else ""
+        order = str(i % 7) if featured else ""
+        lines.append(f",,https://github.com/owner{i % 97}/repo{i % repos}/pull/{i + 1},{featured},{order}")
+    return "\n".join(lines) + "\n"
+
+
+def fake_response(query):
+    """Answer an aliased PR batch query with deterministic synthetic data."""
+    data = {'rateLimit': {'remaining': 5000, 'resetAt': "2100-01-01T00:00:00Z"}}
+    for alias, owner, repo, number in ALIAS_RE.findall(query):
+        n = int(number)
+        data[alias] = {
+            'nameWithOwner': f"{owner}/{repo}",
+            'description': f"{repo} description",
+            'primaryLanguage': {'name': ["Kotlin", "TypeScript", "Rust", "Python"][n % 4]},
+            'repositoryTopics': {'nodes': [{'topic': {'name': "compose"}}] if n % 3 == 0 else []},
+            'pullRequest': {
+                'title': TITLES[n % len(TITLES)].format(n),
+                'url': f"https://github.com/{owner}/{repo}/pull/{n}",
+                'state': STATES[n % len(STATES)],
+                'createdAt': f"{2015 + n % 12}-{1 + n % 12:02d}-{1 + n % 28:02d}T{n % 24:02d}:{n % 60:02d}:00Z",
+                'number': n,
+                'isDraft': n % 11 == 0,
+            },
+        }
+    return {'data': data}
+
+
+class FakeTransport:
+    """In-process stand-in for GitHub with a fixed per-request latency."""
+
+    name = "fake"
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def graphql(self, query):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return fake_response(query)
+
+
+FAKE_GH = '''#!{python}
+import json, sys, time
+sys.path.insert(0, {bench_dir!r})
+from bench_pipeline import fake_response
+time.sleep({latency!r})
+query = next(arg[len("query="):] for arg in sys.argv if arg.startswith("query="))
+print(json.dumps(fake_response(query)))
+'''
+
+
+@contextlib.contextmanager
+def fake_gh_on_path(latency):
+    """Put a fake ``gh`` executable first on ``PATH`` for ``GhTransport``."""
+    tmp = tempfile.mkdtemp(prefix="fake-gh-")
+    path = os.path.join(tmp, "gh")
+    with open(path, "w") as f:
+        f.write(FAKE_GH.format(
+            python=sys.executable, bench_dir=os.path.dirname(os.path.abspath(__file__)), latency=latency,
+        ))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    old_path = os.environ.get("PATH", "")
+    os.environ["PATH"] = tmp + os.pathsep + old_path
+    try:
+        yield
+    finally:
+        os.environ["PATH"] = old_path
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def serve_text(text):
+    """Serve ``text`` as CSV from a local HTTP server; yields its URL."""
+    body = text.encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/sheet.csv"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _timed(timings, stage, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    timings[stage] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def run_once(rows, args):
+    """Run every stage once for a ``rows``-row sheet; returns the result record."""
+    timings = {}
+    fake = FakeTransport(args.latency)
+    github.repo_cache = LoadingCache()
+    github.set_transport(GhTransport() if args.backend == "gh" else fake)
+
+    with serve_text(make_sheet(rows, args.repos)) as url, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        result = _timed(timings, "sheet", sheet.fetch_sheet, url)
+        url_data = result['url_data']
+        data, featured = _timed(
+            timings, "fetch", model.fetch_urls, url_data, None,
+            batch_size=args.batch_size, workers=args.workers,
+        )
+
+    m = _timed(timings, "model", model.build_readme_model, data, featured, backend=args.grouping)
+    md = _timed(timings, "markdown", render.render_model, m, [render.MarkdownSink()])[0].getvalue()
+    js = _timed(timings, "json", render.render_model, m, [render.JsonSink()])[0].getvalue()
+
+    return {
+        'rows': rows,
+        'contributions': sum(len(r['contributions']) for y in m['years'] for mo in y['months'] for r in mo['rows']),
+        'requests': fake.calls if args.backend == "fake" else None,
+        'markdown_bytes': len(md.encode('utf-8')),
+        'json_bytes': len(js.encode('utf-8')),
+        'seconds': timings,
+        'total_seconds': round(sum(timings.values()), 6),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="sheet sizes (rows) to benchmark")
+    parser.add_argument("--repos", type=int, default=300, help="distinct repositories in the sheet")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds of simulated latency per GitHub request")
+    parser.add_argument("--backend", choices=["fake", "gh"], default="fake",
+                        help="in-process fake transport, or GhTransport driving a fake gh executable")
+    parser.add_argument("--batch-size", type=int, default=PR_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--grouping", choices=model.GROUPING_BACKENDS, default="python",
+                        help="month row grouping backend")
+    parser.add_argument("--output", default="bench_results.json", help="machine-readable results file")
+    args = parser.parse_args(argv)
+
+    results = []
+    with fake_gh_on_path(args.latency) if args.backend == "gh" else contextlib.nullcontext():
+        for rows in args.sizes:
+            record = run_once(rows, args)
+            results.append(record)
+            stages = "  ".join(f"{stage}={seconds:.3f}s" for stage, seconds in record['seconds'].items())
+            print(f"{rows:>7} rows: {stages}  total={record['total_seconds']:.3f}s")
+
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'params': {k: v for k, v in vars(args).items() if k not in ('sizes', 'output')},
+        'results': results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
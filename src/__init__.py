@@ -1,12 +1,24 @@
 """OSS contributions README generator.
 
 Submodules:
-    config  – shared constants and lookup maps
-    github  – ``gh`` CLI fetching of PR/repo data
-    sheet   – Google Sheet CSV ingestion
-    model   – data assembly (grouping + render model)
-    render  – markdown and JSON renderers
-    cli     – command-line entry point (``main``)
+    config     – shared constants and lookup maps
+    transport  – ``gh`` CLI and pooled HTTPS transports for GitHub requests
+    ratelimit  – rate-limit-aware scheduling and retries around a transport
+    github     – GraphQL fetching of PR/repo data
+    cache      – persistent PR cache and in-memory repo cache
+    sheet      – Google Sheet CSV ingestion
+    model      – data assembly (grouping + render model)
+    columnar   – columnar month grouping backend (``--grouping columnar``)
+    render     – markdown and JSON renderers
+    stats      – aggregate contribution counts and lookups
+    shards     – per-year snapshot shards with a manifest
+    assets     – local avatar/logo thumbnails for the README
+    events     – pull_request webhook payloads patched into the snapshot
+    tracing    – span timings and Chrome trace export (``--trace``)
+    cli        – command-line entry point (``main``)
 """
 
-__all__ = ["config", "github", "sheet", "model", "render", "cli"]
+__all__ = [
+    "config", "transport", "ratelimit", "github", "cache", "sheet", "model", "columnar",
+    "render", "stats", "shards", "assets", "events", "tracing", "cli",
+]
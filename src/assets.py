@@ -0,0 +1,228 @@
+"""Local thumbnails for README avatars and project logos (``--assets``).
+
+Each distinct image URL is downloaded once per run (conditionally, using the
+ETag/Last-Modified remembered in the directory's manifest), shrunk to the
+size it is displayed at, and stored under a content-hash filename, so an
+unchanged image never rewrites a file. GitHub avatars are resized server
+side via ``?size=``; other images are downscaled with Pillow when it is
+installed and stored as-is otherwise.
+"""
+
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import re
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from .config import ASSETS_DIR, AVATAR_SIZE, FETCH_WORKERS, GITHUB_HOST, LOGO_SIZE, REQUEST_TIMEOUT
+from .render import write_if_changed
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency
+    Image = None
+
+MANIFEST_FILE = "manifest.json"
+
+# Hosts that serve resized avatars for a ``size`` query parameter.
+_RESIZING_HOSTS = {GITHUB_HOST, "avatars.githubusercontent.com"}
+
+_ASSET_NAME = re.compile(r"^[0-9a-f]{16}\.\w+$")
+
+
+def sized_url(url, size):
+    """``url`` with ``size`` set for GitHub avatar hosts; other URLs unchanged."""
+    parsed = urlparse(url)
+    if parsed.netloc.lower() not in _RESIZING_HOSTS:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parsed.query) if k not in ('s', 'size')]
+    query.append(('size', str(size)))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def _extension(content_type, url):
+    ext = mimetypes.guess_extension((content_type or "").split(";")[0].strip())
+    if ext in ('.jpe', '.jpeg'):
+        return '.jpg'
+    if ext:
+        return ext
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    return ext if re.fullmatch(r"\.\w{1,5}", ext) else ".png"
+
+
+def thumbnail(data, size):
+    """Downscale raster image ``data`` to fit ``size`` x ``size`` (PNG).
+
+    Returns ``data`` untouched without Pillow, for images already small
+    enough, and for formats Pillow cannot read (e.g. SVG).
+    """
+    if Image is None:
+        return data
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if max(image.size) <= size:
+                return data
+            image.thumbnail((size, size))
+            out = io.BytesIO()
+            image.save(out, format="PNG", optimize=True)
+            return out.getvalue()
+    except (OSError, ValueError):
+        return data
+
+
+class AssetStore:
+    """Content-addressed image thumbnails in ``directory``.
+
+    An ``offline`` store never downloads: it links the thumbnails already
+    recorded in the manifest and leaves other images remote.
+    """
+
+    def __init__(self, directory=ASSETS_DIR, timeout=REQUEST_TIMEOUT, workers=FETCH_WORKERS,
+                 offline=False):
+        self.directory = directory
+        self.timeout = timeout
+        self.workers = workers
+        self.offline = offline
+        self.manifest = {}
+        self.outcomes = {'downloaded': 0, 'unchanged': 0, 'failed': 0}
+        self._used = set()
+        path = os.path.join(directory, MANIFEST_FILE)
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable asset manifest {path}: {e}")
+
+    def _fetch(self, url, size):
+        """Store the thumbnail of ``url``; returns ``(manifest entry or None, outcome)``.
+
+        On a failed download the previously stored thumbnail, if any, is kept.
+        """
+        entry = self.manifest.get(f"{url}@{size}") or {}
+        if entry.get('file') and not os.path.exists(os.path.join(self.directory, entry['file'])):
+            entry = {}
+        if self.offline:
+            return (entry, 'unchanged') if entry.get('file') else (None, 'failed')
+
+        headers = {'User-Agent': "oss-contributions"}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        request = urllib.request.Request(sized_url(url, size), headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = response.read()
+                content_type = response.headers.get('Content-Type')
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and entry.get('file'):
+                return entry, 'unchanged'
+            print(f"Warning: could not download {url}: HTTP {e.code}")
+            return entry or None, 'failed'
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not download {url}: {e}")
+            return entry or None, 'failed'
+
+        data = thumbnail(data, size)
+        ext = ".png" if data[:8] == b"\x89PNG\r\n\x1a\n" else _extension(content_type, url)
+        name = hashlib.sha256(data).hexdigest()[:16] + ext
+        written = write_if_changed(os.path.join(self.directory, name), data)
+        entry = {'file': name, 'etag': etag, 'last_modified': last_modified}
+        return entry, 'downloaded' if written else 'unchanged'
+
+    def localize(self, requests):
+        """Map each ``(url, size)`` in ``requests`` to a local path (None if unavailable).
+
+        Paths are relative to the repository root, as the README links them.
+        """
+        requests = sorted(set(requests))
+        os.makedirs(self.directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            fetched = list(pool.map(lambda item: self._fetch(*item), requests))
+
+        local = {}
+        for (url, size), (entry, outcome) in zip(requests, fetched):
+            self.outcomes[outcome] += 1
+            if entry is None:
+                local[(url, size)] = None
+                continue
+            key = f"{url}@{size}"
+            self.manifest[key] = entry
+            self._used.add(key)
+            local[(url, size)] = f"{self.directory}/{entry['file']}"
+        return local
+
+    def save(self):
+        """Write the manifest of images used this run and delete unreferenced thumbnails."""
+        if not os.path.isdir(self.directory):
+            return
+        manifest = {key: entry for key, entry in self.manifest.items() if key in self._used}
+        files = {entry['file'] for entry in manifest.values()}
+        for name in os.listdir(self.directory):
+            if _ASSET_NAME.match(name) and name not in files:
+                os.remove(os.path.join(self.directory, name))
+        write_if_changed(
+            os.path.join(self.directory, MANIFEST_FILE),
+            json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+        )
+
+    def stats(self):
+        return dict(self.outcomes)
+
+
+def _derived_key(key, urls):
+    if key is None:
+        return None
+    return hashlib.sha256(f"{key}|assets|{json.dumps(urls)}".encode('utf-8')).hexdigest()
+
+
+def localize_model(model, store):
+    """Copy of ``model`` whose ``logo_url``/``avatar_url`` point at local thumbnails.
+
+    Rows may be shared with a ``RenderMemo``, so they are copied rather than
+    modified; memo keys are re-derived so localized fragments are cached
+    separately from remote-URL ones. Images that cannot be downloaded keep
+    their remote URL.
+    """
+    requests = [(project['avatar_url'], AVATAR_SIZE) for project in model['featured_projects']]
+    requests += [
+        (row['logo_url'], LOGO_SIZE)
+        for year in model['years'] for month in year['months'] for row in month['rows']
+    ]
+    local = store.localize(requests)
+
+    def path(url, size):
+        return local.get((url, size)) or url
+
+    years = []
+    for year in model['years']:
+        months = []
+        for month in year['months']:
+            rows = [{**row, 'logo_url': path(row['logo_url'], LOGO_SIZE)} for row in month['rows']]
+            months.append({
+                **month,
+                'rows': rows,
+                'key': _derived_key(month.get('key'), [row['logo_url'] for row in rows]),
+            })
+        years.append({
+            **year,
+            'months': months,
+            'key': _derived_key(year.get('key'), [month['key'] for month in months]),
+        })
+
+    return {
+        **model,
+        'featured_projects': [
+            {**project, 'avatar_url': path(project['avatar_url'], AVATAR_SIZE)}
+            for project in model['featured_projects']
+        ],
+        'years': years,
+    }
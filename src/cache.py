@@ -0,0 +1,319 @@
+"""Caches: persistent PR details (by canonical PR URL) and in-memory repo metadata."""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .config import (
+    PR_CACHE_TTL,
+    REPO_CACHE_SIZE,
+    REPO_NEGATIVE_TTL,
+    TERMINAL_STATUSES,
+    canonical_pr_url,
+    parse_pr_url,
+)
+
+
+def pr_status(details):
+    """Return the display status (``DRAFT`` wins over ``state``) of a PR dict."""
+    return 'DRAFT' if details.get('isDraft') else details['state'].upper()
+
+
+def _cacheable(details):
+    """``details`` without ``repo_info``, which is derived and recomputed on use.
+
+    Seeded details (``details_from_snapshot``) keep it: they have no raw repo
+    fields to recompute it from.
+    """
+    if details.get('seeded'):
+        return dict(details)
+    return {key: value for key, value in details.items() if key != 'repo_info'}
+
+
+def details_from_snapshot(snapshot, statuses=TERMINAL_STATUSES):
+    """Rebuild ``{url: details}`` for every PR recorded in ``snapshot`` whose
+    status is in ``statuses`` (terminal PRs by default; ``None`` for all).
+
+    The details mirror what ``get_pr_details`` returns, plus the row's
+    ``repo_info`` so no repo lookup is needed (marked ``seeded`` so the PR
+    cache keeps it). Contributions written before
+    snapshots carried ``created_at`` are skipped (and therefore refetched).
+    """
+    known = {}
+    for year in snapshot.get('years', []):
+        for month in year.get('months', []):
+            for row in month.get('rows', []):
+                status = row.get('status', '').upper()
+                if statuses is not None and status not in statuses:
+                    continue
+                for item in row.get('contributions', []):
+                    key = parse_pr_url(item.get('url', ''))
+                    if key is None or not item.get('created_at'):
+                        continue
+                    known[item['url']] = {
+                        'title': item['title'],
+                        'url': item['url'],
+                        'state': 'OPEN' if status == 'DRAFT' else status,
+                        'createdAt': item['created_at'],
+                        'number': item['number'],
+                        'isDraft': status == 'DRAFT',
+                        'repository': {'nameWithOwner': f"{key[0]}/{key[1]}"},
+                        'repo_info': {'description': '', 'tech_stack': row.get('tech_stack', '')},
+                        'seeded': True,
+                    }
+    return known
+
+
+class PRCache:
+    """JSON-backed PR details cache.
+
+    Entries for terminal PRs (MERGED/CLOSED) are treated as immutable; OPEN
+    and DRAFT entries expire after ``ttl`` seconds and are evicted on lookup.
+    Only fetched fields are kept: the derived ``repo_info`` is dropped, so a
+    ``TOPIC_MAP`` edit or an upstream language/topic change is picked up.
+    """
+
+    def __init__(self, path=None, ttl=PR_CACHE_TTL, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, ttl=PR_CACHE_TTL, clock=time.time):
+        """Create a cache backed by ``path``, reading existing entries if present."""
+        cache = cls(path, ttl=ttl, clock=clock)
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    cache.entries = json.load(f).get('entries', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable PR cache {path}: {e}")
+        return cache
+
+    def get(self, url):
+        """Return a copy of the cached details for ``url``, or None on a miss."""
+        key = canonical_pr_url(url)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            details = entry['details']
+            if pr_status(details) not in TERMINAL_STATUSES:
+                if self.clock() - entry.get('fetched_at', 0) > self.ttl:
+                    del self.entries[key]
+                    self.evictions += 1
+                    self.misses += 1
+                    return None
+            self.hits += 1
+            return _cacheable(details)
+
+    def peek(self, url):
+        """Return a copy of the details last stored for ``url``, even if expired.
+
+        Does not count as a hit or miss and never evicts; used as a fallback
+        when there is no time left to refetch.
+        """
+        with self._lock:
+            entry = self.entries.get(canonical_pr_url(url))
+            return _cacheable(entry['details']) if entry is not None else None
+
+    def put(self, url, details):
+        """Store ``details`` (as fetched) for ``url``."""
+        with self._lock:
+            self.entries[canonical_pr_url(url)] = {
+                'details': _cacheable(details),
+                'fetched_at': self.clock(),
+            }
+
+    def seed(self, details_by_url):
+        """Add ``details_by_url`` without overwriting entries already cached."""
+        with self._lock:
+            for url, details in details_by_url.items():
+                self.entries.setdefault(canonical_pr_url(url), {
+                    'details': _cacheable(details),
+                    'fetched_at': self.clock(),
+                })
+
+    def save(self):
+        """Write the cache back to ``path`` (no-op for in-memory caches)."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'entries': self.entries}, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class LoadingCache:
+    """Thread-safe LRU cache that coalesces concurrent loads of the same key.
+
+    ``get_or_load`` runs ``loader(key)`` at most once per key at a time;
+    other callers asking for that key wait for the in-flight result. A
+    failed load is replaced by ``fallback(key, exc)``, which is cached for
+    ``negative_ttl`` seconds so the failure is not retried on every call.
+    """
+
+    def __init__(self, maxsize=REPO_CACHE_SIZE, negative_ttl=REPO_NEGATIVE_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._live_entry(key) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _live_entry(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        _, expires_at = entry
+        if expires_at is not None and self.clock() >= expires_at:
+            del self._entries[key]
+            return None
+        return entry
+
+    def _store(self, key, value, expires_at=None):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def put(self, key, value):
+        """Store a successfully loaded ``value`` (e.g. learned from another query)."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key, loader, fallback):
+        """Return the cached value for ``key``, loading it if necessary."""
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+                owner = True
+        if not owner:
+            return future.result()
+
+        expires_at = None
+        try:
+            value = loader(key)
+        except Exception as e:
+            value = fallback(key, e)
+            expires_at = self.clock() + self.negative_ttl
+
+        with self._lock:
+            if expires_at is not None:
+                self.failures += 1
+            self._store(key, value, expires_at)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'failures': self.failures,
+            'size': len(self._entries),
+        }
+
+
+class RenderMemo:
+    """Content-addressed memo of built month rows and rendered fragments.
+
+    Keys are content hashes (see ``model.month_key``), so an entry never
+    goes stale; entries not used during a run are dropped on ``save``.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.rows = {}
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+        self._used = set()
+
+    @classmethod
+    def load(cls, path):
+        memo = cls(path)
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                memo.rows = data.get('rows', {})
+                memo.fragments = data.get('fragments', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable render cache {path}: {e}")
+        return memo
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def get_or_build(self, key, build):
+        """Return the rows stored under ``key``, calling ``build()`` on a miss."""
+        self._used.add(key)
+        if key in self.rows:
+            self.hits += 1
+            return self.rows[key]
+        self.misses += 1
+        rows = self.rows[key] = build()
+        return rows
+
+    def fragment(self, key, kind, render):
+        """Return the ``kind`` fragment stored under ``key``, calling ``render()`` on a miss."""
+        self._used.add(key)
+        by_kind = self.fragments.setdefault(key, {})
+        if kind not in by_kind:
+            by_kind[kind] = render()
+        return by_kind[kind]
+
+    def save(self):
+        """Write the entries used this run back to ``path``."""
+        if not self.path:
+            return
+        data = {
+            'rows': {k: v for k, v in self.rows.items() if k in self._used},
+            'fragments': {k: v for k, v in self.fragments.items() if k in self._used},
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
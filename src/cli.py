@@ -1,11 +1,35 @@
 """Command-line entry point."""
 
+import argparse
+import json
+import os
 import sys
 
-from .config import SHEET_URL
-from .model import build_readme_model, fetch_urls
-from .render import generate_json_snapshot, generate_markdown
-from .sheet import fetch_urls_from_sheet
+from . import events, shards, tracing
+from .assets import AssetStore, localize_model
+from .cache import PRCache, RenderMemo, details_from_snapshot
+from .config import (
+    ASSETS_DIR,
+    FETCH_WORKERS,
+    PR_BATCH_SIZE,
+    PR_CACHE_FILE,
+    PR_CACHE_TTL,
+    README_FILE,
+    REQUEST_TIMEOUT,
+    RENDER_CACHE_FILE,
+    RUN_STATE_FILE,
+    SHEET_CACHE_FILE,
+    SHARDS_DIR,
+    SHEET_URL,
+    SNAPSHOT_FILE,
+    TRACE_TOP_N,
+)
+from .github import outcome_summary, outcomes, repo_cache, set_transport
+from .model import GROUPING_BACKENDS, build_readme_model, fetch_urls, model_from_snapshot, run_fingerprint
+from .render import JsonSink, MarkdownSink, render_outputs, write_if_changed
+from .ratelimit import HedgedTransport, RateLimitedTransport
+from .sheet import fetch_sheet
+from .transport import TRANSPORTS, TransportError
 
 
 def _count_contributions(model):
@@ -17,18 +41,329 @@ def _count_contributions(model):
     )
 
 
-def main():
+def _load_fingerprint(path):
+    try:
+        with open(path) as f:
+            return json.load(f).get('fingerprint')
+    except (OSError, ValueError):
+        return None
+
+
+def _print_summary(cache, scheduler, hedger=None):
+    if cache is not None:
+        stats = cache.stats()
+        print(f"PR cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions.")
+    stats = scheduler.stats()
+    print(f"Rate limit: {stats['throttled']} throttled waits, {stats['retries']} retries, "
+          f"{stats['failures']} failed requests, {stats['waited_seconds']:.1f}s waited.")
+    if hedger is not None:
+        stats = hedger.stats()
+        print(f"Hedging: {stats['hedged']} duplicate requests, {stats['hedge_wins']} answered first.")
+    stats = repo_cache.stats()
+    print(f"Repo cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['coalesced']} coalesced, {stats['failures']} failures.")
+    counts = outcome_summary()
+    print(f"PR fetches: {counts['fetched']} fetched, {counts['retried']} retried, "
+          f"{counts['failed']} failed, {counts['gone']} gone.")
+    for url, outcome in sorted(outcomes.items()):
+        if outcome != 'fetched':
+            print(f"  {outcome:<8} {url}")
+
+
+def _print_slowest_calls(tracer, n=TRACE_TOP_N):
+    calls = tracer.slowest("github", n)
+    if not calls:
+        return
+    print(f"Slowest GitHub calls (top {len(calls)}):")
+    for event in calls:
+        args = event['args']
+        urls = args.get('urls')
+        target = args.get('repo', '')
+        if urls:
+            target = urls[0] + (f" (+{len(urls) - 1} more)" if len(urls) > 1 else "")
+        if 'exit_code' in args:
+            outcome = f"exit {args['exit_code']}"
+        elif 'status' in args:
+            outcome = f"HTTP {args['status']}"
+        else:
+            outcome = args.get('error', "-")
+        print(f"  {event['dur'] / 1000:8.1f} ms  {outcome:<10} {target}")
+
+
+def _print_stale(stale, budget):
+    for reason in ('budget', 'failed'):
+        items = [item for item in stale if item['reason'] == reason]
+        if not items:
+            continue
+        sources = {source: sum(1 for item in items if item['source'] == source)
+                   for source in ('cache', 'snapshot', 'missing')}
+        cause = f"Fetch budget of {budget:g}s ran out" if reason == 'budget' else "Fetching failed"
+        print(f"{cause}; {len(items)} PRs were not refreshed "
+              f"({sources['cache']} from the PR cache, {sources['snapshot']} from {SNAPSHOT_FILE}, "
+              f"{sources['missing']} missing):")
+        for item in items:
+            print(f"  {item['source']:<8} {item['url']}")
+
+
+ASSETS_OFFLINE_HELP = (
+    f"link the thumbnails already stored in {ASSETS_DIR}/ (by update --assets) instead of "
+    "remote images; nothing is downloaded"
+)
+
+
+def _offline_assets(model):
+    """``model`` linking the thumbnails already in ``ASSETS_DIR`` (no downloads)."""
+    store = AssetStore(ASSETS_DIR, offline=True)
+    local = localize_model(model, store)
+    stats = store.stats()
+    print(f"Assets: {stats['unchanged']} local thumbnails linked, {stats['failed']} left remote.")
+    return local
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Generate README.md and README_DATA.json. Without a command, runs a "
+                    "full update from the Google Sheet and GitHub.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=FETCH_WORKERS,
+        help=f"number of concurrent GitHub fetches (default: {FETCH_WORKERS}; 1 = serial)",
+    )
+    parser.add_argument(
+        "--transport", choices=sorted(TRANSPORTS), default="gh",
+        help="how to reach GitHub: the gh CLI (default) or an in-process HTTPS client using GH_TOKEN",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=REQUEST_TIMEOUT, metavar="SECONDS",
+        help="per-request timeout for GitHub calls; timed-out calls are retried "
+             f"(default: {REQUEST_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--hedge", action="store_true",
+        help="send a duplicate GitHub request when a call outlasts the p95 of recent latencies",
+    )
+    parser.add_argument(
+        "--cache", default=PR_CACHE_FILE, metavar="PATH",
+        help=f"persistent PR cache file (default: {PR_CACHE_FILE})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="disable the persistent PR/render caches and conditional sheet requests",
+    )
+    parser.add_argument(
+        "--cache-ttl", type=int, default=PR_CACHE_TTL, metavar="SECONDS",
+        help=f"max age of cached OPEN/DRAFT PRs (default: {PR_CACHE_TTL})",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help=f"reuse MERGED/CLOSED PRs from the previous {SNAPSHOT_FILE}; "
+             "fetch only new URLs and OPEN/DRAFT PRs",
+    )
+    parser.add_argument(
+        "--budget", type=float, metavar="SECONDS",
+        help="time budget for GitHub fetches: new and OPEN/DRAFT PRs are fetched first and "
+             f"whatever is left when it runs out reuses the PR cache or {SNAPSHOT_FILE}",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="regenerate the artifacts even if the run inputs are unchanged",
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help=f"add a Stats section (totals, top projects and tech stacks) to {README_FILE}",
+    )
+    parser.add_argument(
+        "--assets", action="store_true",
+        help=f"store downscaled avatar/logo thumbnails in {ASSETS_DIR}/ and link them from {README_FILE}",
+    )
+    parser.add_argument(
+        "--shards", action="store_true",
+        help=f"also write the snapshot as one file per year plus a manifest in {SHARDS_DIR}/",
+    )
+    parser.add_argument(
+        "--shard-format", choices=sorted(shards.SHARD_FORMATS), default="json",
+        help="encoding of each year shard (default: json)",
+    )
+    parser.add_argument(
+        "--grouping", choices=GROUPING_BACKENDS, default="python",
+        help="how month rows are sorted and grouped: per-month Python sorts (default) or "
+             "columnar arrays sorted in one pass (uses NumPy when installed)",
+    )
+    parser.add_argument(
+        "--trace", metavar="PATH",
+        help="write per-stage and per-request timings as a Chrome trace-event JSON file "
+             "(open in chrome://tracing or Perfetto) and list the slowest GitHub calls",
+    )
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    render = commands.add_parser(
+        "render", help=f"re-render README.md from {SNAPSHOT_FILE} without any network access",
+    )
+    render.add_argument("--snapshot", default=SNAPSHOT_FILE, metavar="PATH",
+                        help=f"snapshot or shard manifest to read (default: {SNAPSHOT_FILE})")
+    render.add_argument("--output", default=README_FILE, metavar="PATH",
+                        help=f"markdown file to write (default: {README_FILE})")
+    render.add_argument("--stats", action="store_true",
+                        help="add a Stats section built from the snapshot's aggregate counts")
+    render.add_argument("--assets", action="store_true", help=ASSETS_OFFLINE_HELP)
+
+    event = commands.add_parser(
+        "apply-event",
+        help=f"patch one PR from a GitHub pull_request webhook payload into {SNAPSHOT_FILE} "
+             "and re-render, without any network access",
+    )
+    event.add_argument("payload", nargs="?", default="-",
+                       help="webhook payload JSON file (default: read stdin)")
+    event.add_argument("--snapshot", default=SNAPSHOT_FILE, metavar="PATH",
+                       help=f"snapshot or shard manifest to patch (default: {SNAPSHOT_FILE})")
+    event.add_argument("--output", default=README_FILE, metavar="PATH",
+                       help=f"markdown file to write (default: {README_FILE})")
+    event.add_argument("--status", action="append", metavar="STATUS",
+                       help="status to keep (repeatable; default: all); a PR moving to any "
+                            "other status is removed")
+    event.add_argument("--stats", action="store_true",
+                       help="add a Stats section built from the snapshot's aggregate counts")
+    event.add_argument("--assets", action="store_true", help=ASSETS_OFFLINE_HELP)
+    event.add_argument("--cache", default=PR_CACHE_FILE, metavar="PATH",
+                       help=f"PR cache whose entry for the PR is updated, if any (default: {PR_CACHE_FILE})")
+    return parser.parse_args(argv)
+
+
+def render_snapshot(snapshot_file=SNAPSHOT_FILE, output_file=README_FILE, stats=False, assets=False):
+    """Rebuild ``output_file`` from an existing snapshot (no network access)."""
+    snapshot = shards.load_snapshot(snapshot_file)
+    if snapshot is None:
+        print(f"Error: {snapshot_file} not found or unreadable.")
+        return 1
+
+    model = model_from_snapshot(snapshot)
+    if assets:
+        model = _offline_assets(model)
+    if render_outputs(model, {output_file: MarkdownSink(stats=stats)}):
+        print(f"Done! {output_file} re-rendered from {snapshot_file}.")
+    else:
+        print(f"Done! {output_file} already matches {snapshot_file}.")
+    return 0
+
+
+def _cache_event(cache_file, payload):
+    """Refresh the PR cache entry (if any) of the PR in ``payload``.
+
+    Otherwise the next ``update`` would serve the pre-event state from the
+    cache (e.g. an OPEN PR the event merged) and undo the patch.
+    """
+    details = events.pr_from_event(payload)
+    if details is None or not cache_file or not os.path.exists(cache_file):
+        return
+    cache = PRCache.load(cache_file)
+    previous = cache.peek(details['url'])
+    if previous is not None:
+        # Keep the repo fields the event does not carry.
+        cache.put(details['url'], {**previous, **details})
+        cache.save()
+
+
+def apply_event(payload_file="-", snapshot_file=SNAPSHOT_FILE, output_file=README_FILE,
+                allowed_statuses=None, stats=False, assets=False, cache_file=PR_CACHE_FILE):
+    """Patch one PR from a webhook payload into the snapshot and re-render both files."""
+    try:
+        if payload_file == "-":
+            payload = json.load(sys.stdin)
+        else:
+            with open(payload_file) as f:
+                payload = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read webhook payload {payload_file}: {e}")
+        return 1
+    snapshot = shards.load_snapshot(snapshot_file)
+    if snapshot is None:
+        print(f"Error: {snapshot_file} not found or unreadable.")
+        return 1
+
+    if allowed_statuses is not None:
+        allowed_statuses = {status.upper() for status in allowed_statuses}
+    try:
+        changed = events.apply_event(snapshot, payload, allowed_statuses)
+    except ValueError as e:
+        print(f"Error: cannot apply the event to {snapshot_file}: {e}.")
+        return 1
+    _cache_event(cache_file, payload)
+    if not changed:
+        print("Done! Nothing to update.")
+        return 0
+
+    model = model_from_snapshot(snapshot)
+    # As in update, only the README links local thumbnails.
+    readme_model = _offline_assets(model) if assets else model
+    written = render_outputs(readme_model, {output_file: MarkdownSink(stats=stats)})
+    # Patch a manifest's shards in place, and README_DATA.json too if it exists;
+    # with README_DATA.json, refresh the shards next to it too.
+    manifest = snapshot_file
+    if shards.manifest_format(snapshot_file) is None:
+        written += render_outputs(model, {snapshot_file: JsonSink()})
+        manifest = os.path.join(SHARDS_DIR, shards.MANIFEST_FILE)
+    elif os.path.exists(SNAPSHOT_FILE):
+        written += render_outputs(model, {SNAPSHOT_FILE: JsonSink()})
+    shard_format = shards.manifest_format(manifest)
+    if shard_format is not None:
+        written += shards.write_shards(model, os.path.dirname(manifest) or ".", shard_format)
+    if written:
+        print(f"Done! Updated {' and '.join(written)}.")
+    else:
+        print(f"Done! {output_file} and {snapshot_file} were already up to date.")
+    return 0
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.command == "render":
+        return render_snapshot(args.snapshot, args.output, args.stats, args.assets)
+    if args.command == "apply-event":
+        return apply_event(args.payload, args.snapshot, args.output, args.status, args.stats, args.assets,
+                           args.cache)
+    if not args.trace:
+        return update(args)
+
+    tracer = tracing.Tracer()
+    tracing.set_tracer(tracer)
+    try:
+        with tracer.span("update"):
+            return update(args)
+    finally:
+        tracing.set_tracer(tracing.NullTracer())
+        tracer.write(args.trace)
+        print(f"Trace written to {args.trace}.")
+        _print_slowest_calls(tracer)
+
+
+def update(args):
+    """Full refresh: read the sheet, fetch PRs and regenerate both artifacts."""
     if not SHEET_URL:
         print("Error: SHEET_URL is not set. Please publish your Google Sheet as CSV "
               "and set the URL in the script.")
         return 1
 
+    try:
+        inner = TRANSPORTS[args.transport](timeout=args.timeout)
+        hedger = HedgedTransport(inner, workers=args.workers) if args.hedge else None
+        scheduler = RateLimitedTransport(hedger or inner)
+        set_transport(scheduler)
+    except TransportError as e:
+        print(f"Error: cannot use the {args.transport} transport: {e}")
+        return 1
+
     print("Fetching URLs from Google Sheet...")
     try:
-        url_data, allowed_statuses = fetch_urls_from_sheet(SHEET_URL)
+        with tracing.span("sheet") as span:
+            sheet = fetch_sheet(SHEET_URL, None if args.no_cache else SHEET_CACHE_FILE)
+            span.update(rows=len(sheet['url_data']), unchanged=sheet['unchanged'])
     except Exception as e:
         print(f"Error fetching from Google Sheet: {e}")
         return 1
+    url_data, allowed_statuses = sheet['url_data'], sheet['allowed']
+    if sheet['unchanged']:
+        print("Google Sheet unchanged since the last run.")
 
     print(f"Found {len(url_data)} URLs.")
 
@@ -39,18 +374,88 @@ def main():
     elif allowed_statuses:
         print(f"Filtering for statuses: {allowed_statuses}")
 
-    data, featured_repos = fetch_urls(url_data, allowed_statuses)
+    cache = None if args.no_cache else PRCache.load(args.cache, ttl=args.cache_ttl)
+
+    snapshot = (shards.load_snapshot(SNAPSHOT_FILE)
+                or shards.load_snapshot(os.path.join(SHARDS_DIR, shards.MANIFEST_FILE)))
+    if args.incremental:
+        if snapshot is None:
+            print(f"No previous {SNAPSHOT_FILE} found; running a full refresh.")
+        else:
+            known = details_from_snapshot(snapshot)
+            print(f"Incremental mode: reusing {len(known)} PRs from {SNAPSHOT_FILE}.")
+            if cache is None:
+                # TTL 0: anything not seeded from the snapshot is refetched.
+                cache = PRCache(ttl=0)
+            cache.seed(known)
+
+    # Last known details for PRs that cannot be fetched this run.
+    fallback = details_from_snapshot(snapshot, statuses=None) if snapshot is not None else None
+
+    stale = []
+    with tracing.span("fetch", urls=len(url_data), workers=args.workers) as span:
+        data, featured_repos = fetch_urls(
+            url_data, allowed_statuses, batch_size=PR_BATCH_SIZE, workers=args.workers, cache=cache,
+            budget=args.budget, fallback=fallback, stale=stale,
+        )
+        span.update(stale=len(stale))
+    if stale:
+        _print_stale(stale, args.budget)
+
+    if cache is not None:
+        cache.save()
+
+    options = {'stats': args.stats, 'assets': args.assets,
+               'shards': args.shard_format if args.shards else None}
+    fingerprint = run_fingerprint(sheet['sha256'], data, featured_repos, options)
+    if (not args.force and fingerprint == _load_fingerprint(RUN_STATE_FILE)
+            and os.path.exists(README_FILE) and os.path.exists(SNAPSHOT_FILE)
+            and (not args.shards or os.path.exists(os.path.join(SHARDS_DIR, shards.MANIFEST_FILE)))):
+        print(f"Inputs unchanged since the last run; {README_FILE} and {SNAPSHOT_FILE} left as is.")
+        _print_summary(cache, scheduler, hedger)
+        return 0
 
-    model = build_readme_model(data, featured_repos)
+    memo = RenderMemo() if args.no_cache else RenderMemo.load(RENDER_CACHE_FILE)
+    with tracing.span("model"):
+        model = build_readme_model(data, featured_repos, memo=memo, backend=args.grouping)
+    # The grouped records are not needed once the model is built.
+    del data
 
     if _count_contributions(model) == 0:
         print("No contributions found; refusing to overwrite existing artifacts.")
         return 1
 
-    generate_markdown(data, featured_repos, model=model)
-    generate_json_snapshot(data, featured_repos, model=model)
+    if args.assets:
+        # Only the README links local thumbnails; the snapshot keeps the source URLs.
+        store = AssetStore(timeout=args.timeout, workers=args.workers)
+        with tracing.span("assets"):
+            readme_model = localize_model(model, store)
+            store.save()
+        stats = store.stats()
+        print(f"Assets: {stats['downloaded']} thumbnails written, {stats['unchanged']} unchanged, "
+              f"{stats['failed']} failed.")
+        with tracing.span("render") as span:
+            written = render_outputs(readme_model, {README_FILE: MarkdownSink(stats=args.stats)}, memo)
+            written += render_outputs(model, {SNAPSHOT_FILE: JsonSink()}, memo)
+            span.update(written=written)
+    else:
+        with tracing.span("render") as span:
+            outputs = {README_FILE: MarkdownSink(stats=args.stats), SNAPSHOT_FILE: JsonSink()}
+            written = render_outputs(model, outputs, memo)
+            span.update(written=written)
+    if args.shards:
+        with tracing.span("shards"):
+            written += shards.write_shards(model, SHARDS_DIR, args.shard_format)
+    memo.save()
+    stats = memo.stats()
+    print(f"Render cache: {stats['hits']} months reused, {stats['misses']} rebuilt.")
+    write_if_changed(RUN_STATE_FILE, json.dumps({'fingerprint': fingerprint}) + "\n")
 
-    print("Done! README.md and README_DATA.json updated.")
+    if written:
+        print(f"Done! Updated {' and '.join(written)}.")
+    else:
+        print(f"Done! {README_FILE} and {SNAPSHOT_FILE} were already up to date.")
+    _print_summary(cache, scheduler, hedger)
     return 0
 
 
@@ -0,0 +1,98 @@
+"""Columnar grouping of contributions into month rows (``--grouping columnar``).
+
+Every month's records are flattened into parallel integer columns and
+ordered by ``(month, repo, status, -timestamp, sheet_index)`` with one
+stable sort; group boundaries and each group's newest timestamp fall out
+of the sorted columns. NumPy is used when installed, otherwise the columns
+are stdlib ``array``s and the sort is a single ``sorted`` over indices.
+The resulting grouping is identical to ``model.build_month_rows``.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+def _codes(values):
+    """Map strings to integer codes that sort in the same order as the strings."""
+    rank = {value: code for code, value in enumerate(sorted(set(values)))}
+    return [rank[value] for value in values]
+
+
+def _columns(months):
+    records = [pr for prs in months for pr in prs]
+    month_ids = [m for m, prs in enumerate(months) for _ in prs]
+    return (
+        records,
+        month_ids,
+        _codes([pr.repo_key for pr in records]),
+        _codes([pr.status for pr in records]),
+        [pr.timestamp for pr in records],
+        [pr.sheet_index for pr in records],
+    )
+
+
+def _group_numpy(month_ids, repos, statuses, timestamps, sheet_indexes):
+    month_ids = np.asarray(month_ids, dtype=np.int64)
+    repos = np.asarray(repos, dtype=np.int64)
+    statuses = np.asarray(statuses, dtype=np.int64)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    sheet_indexes = np.asarray(sheet_indexes, dtype=np.int64)
+
+    # lexsort is stable and treats its last key as the primary one.
+    order = np.lexsort((sheet_indexes, -timestamps, statuses, repos, month_ids))
+    keys = np.stack((month_ids[order], repos[order], statuses[order]))
+    starts = np.flatnonzero(np.concatenate(([True], (np.diff(keys, axis=1) != 0).any(axis=0))))
+    ends = np.append(starts[1:], len(order))
+    # Within a group the newest PR sorts first.
+    newest = timestamps[order[starts]]
+    group_months = month_ids[order[starts]]
+    group_order = np.lexsort((-newest, group_months))
+    return order.tolist(), starts.tolist(), ends.tolist(), group_months.tolist(), group_order.tolist()
+
+
+def _group_array(month_ids, repos, statuses, timestamps, sheet_indexes):
+    month_ids = array('q', month_ids)
+    repos = array('q', repos)
+    statuses = array('q', statuses)
+    timestamps = array('q', timestamps)
+    sheet_indexes = array('q', sheet_indexes)
+
+    order = sorted(
+        range(len(month_ids)),
+        key=lambda i: (month_ids[i], repos[i], statuses[i], -timestamps[i], sheet_indexes[i]),
+    )
+    starts = array('q')
+    previous = None
+    for position, i in enumerate(order):
+        key = (month_ids[i], repos[i], statuses[i])
+        if key != previous:
+            starts.append(position)
+            previous = key
+    ends = starts[1:] + array('q', [len(order)])
+    newest = array('q', (timestamps[order[start]] for start in starts))
+    group_months = array('q', (month_ids[order[start]] for start in starts))
+    group_order = sorted(range(len(starts)), key=lambda g: (group_months[g], -newest[g]))
+    return order, starts, ends, group_months, group_order
+
+
+def group_months(months):
+    """Group each month's records into table rows.
+
+    ``months`` is a list of ``Contribution`` lists. Returns, per month, the
+    list of row groups (each a list of records, newest first) in the order
+    the rows are rendered.
+    """
+    records, *columns = _columns(months)
+    grouped = [[] for _ in months]
+    if not records:
+        return grouped
+
+    group = _group_numpy if np is not None else _group_array
+    order, starts, ends, month_of_group, group_order = group(*columns)
+    for g in group_order:
+        grouped[month_of_group[g]].append([records[i] for i in order[starts[g]:ends[g]]])
+    return grouped
@@ -9,9 +9,71 @@ SHEET_URL = (
 
 GITHUB_HOST = "github.com"
 
+# REST/GraphQL API root used by the in-process HTTP transport.
+GITHUB_API_URL = "https://api.github.com"
+
 # Marker that a URL points at a pull request (path segment).
 PR_PATH_MARKER = "/pull/"
 
+# Number of PRs packed into a single aliased GraphQL query.
+PR_BATCH_SIZE = 50
+
+# Default number of concurrent fetches (``--workers`` overrides).
+FETCH_WORKERS = 8
+
+# Generated artifacts.
+README_FILE = "README.md"
+SNAPSHOT_FILE = "README_DATA.json"
+
+# Conditional-request state for the sheet (ETag/Last-Modified, content hash
+# and the parsed rows of the last fetch).
+SHEET_CACHE_FILE = ".sheet_cache.json"
+
+# Memoized month rows and rendered year/month fragments, keyed by a
+# content hash of their input contributions.
+RENDER_CACHE_FILE = ".render_cache.json"
+
+# Fingerprint of the inputs of the last successful run (see
+# ``model.run_fingerprint``); a matching fingerprint skips regeneration.
+RUN_STATE_FILE = ".run_state.json"
+
+# Rate-limit scheduling: stop sending requests while the remaining GraphQL
+# budget is at or below the reserve (until the reset time), and retry
+# secondary-rate-limit/5xx failures with jittered exponential backoff.
+RATE_LIMIT_RESERVE = 50
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Per-request timeout (seconds) for ``gh`` subprocesses and HTTPS calls;
+# timeouts are retried like 5xx responses. With ``--hedge``, a duplicate
+# request is sent once a call outlasts the HEDGE_QUANTILE of recent
+# latencies (after HEDGE_MIN_SAMPLES successful calls).
+REQUEST_TIMEOUT = 30
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+
+# Rows per table in the optional README Stats section (``--stats``).
+STATS_TOP_N = 10
+
+# Number of slowest GitHub calls listed after a ``--trace`` run.
+TRACE_TOP_N = 10
+
+# On-disk PR cache (next to README_DATA.json). MERGED/CLOSED entries never
+# expire; OPEN/DRAFT entries are refetched once older than the TTL.
+PR_CACHE_FILE = ".pr_cache.json"
+PR_CACHE_TTL = 6 * 60 * 60
+TERMINAL_STATUSES = frozenset({'MERGED', 'CLOSED'})
+
+# With ``--budget``, MERGED/CLOSED PRs created within this many days are
+# refreshed before older ones.
+RECENT_PR_DAYS = 30
+
+# In-memory repo metadata cache: LRU bound and how long failed lookups
+# (deleted/private repos) are remembered before being retried.
+REPO_CACHE_SIZE = 1024
+REPO_NEGATIVE_TTL = 5 * 60
+
 # Human-friendly topic aliases pulled from repo topics.
 TOPIC_MAP = {
     'compose': 'Jetpack Compose',
@@ -29,6 +91,15 @@ CUSTOM_LOGOS = {
     )
 }
 
+# Per-year snapshot shards and their manifest (``--shards``).
+SHARDS_DIR = "data"
+
+# Local thumbnails (``--assets``): directory (committed with the README) and
+# download sizes in pixels, twice the displayed 24px logos / 60px avatars.
+ASSETS_DIR = "assets/logos"
+LOGO_SIZE = 48
+AVATAR_SIZE = 120
+
 # Emoji shown next to each PR status (single source for both table and legend).
 STATUS_ICONS = {
     'DRAFT': '🚧',
@@ -89,4 +160,28 @@ DEFAULT_PR_EMOJI = '🔨'
 
 def is_github_url(url):
     """Return True if ``url`` points at github.com."""
-    return urlparse(url).netloc == GITHUB_HOST
+    return urlparse(url).netloc.lower() == GITHUB_HOST
+
+
+def parse_pr_url(url):
+    """Return ``(owner, repo, number)`` for a github.com PR URL, else None."""
+    parsed = urlparse(url)
+    if parsed.netloc.lower() != GITHUB_HOST:
+        return None
+    parts = parsed.path.strip("/").split("/")
+    if len(parts) < 4 or parts[2] != "pull" or not parts[3].isdigit():
+        return None
+    return parts[0], parts[1], int(parts[3])
+
+
+def canonical_pr_url(url):
+    """Return a canonical ``https://github.com/owner/repo/pull/N`` form of ``url``.
+
+    Owner and repo are lower-cased (GitHub treats them case-insensitively).
+    Non-PR URLs are returned unchanged.
+    """
+    key = parse_pr_url(url)
+    if key is None:
+        return url
+    owner, repo, number = key
+    return f"https://{GITHUB_HOST}/{owner.lower()}/{repo.lower()}/pull/{number}"
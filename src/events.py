@@ -0,0 +1,103 @@
+"""GitHub ``pull_request`` webhook events applied to a snapshot (``apply-event``).
+
+A payload carries the PR's current title, state and draft flag, so one PR
+can be patched into ``README_DATA.json`` without any API call: only its
+month is regrouped (``build_month_rows``) and re-sorted, everything else is
+kept as-is. PRs that are not in the snapshot are ignored; adding a PR is
+still a sheet edit plus a full run.
+"""
+
+from .cache import pr_status
+from .config import canonical_pr_url
+from .model import Contribution, build_month_rows
+from .render import snapshot_row
+
+
+def pr_from_event(payload):
+    """``get_pr_details``-shaped dict for the PR in a webhook payload, or None."""
+    pr = payload.get('pull_request')
+    if not pr:
+        return None
+    repository = payload.get('repository') or (pr.get('base') or {}).get('repo') or {}
+    return {
+        'number': pr['number'],
+        'title': pr['title'],
+        'url': pr['html_url'],
+        'createdAt': pr['created_at'],
+        'state': 'MERGED' if pr.get('merged') or pr.get('merged_at') else pr['state'].upper(),
+        'isDraft': bool(pr.get('draft')),
+        'repository': {'nameWithOwner': repository.get('full_name')},
+    }
+
+
+def _month_records(month):
+    """The month's rows as ``Contribution`` records in their current order.
+
+    The snapshot has no sheet positions, so the current order stands in for
+    ``sheet_index``: ties keep the order they were rendered in. Raises
+    ``ValueError`` for snapshots written before rows carried ``created_at``.
+    """
+    if any(not item.get('created_at') for row in month['rows'] for item in row['contributions']):
+        raise ValueError("the snapshot has no PR creation dates (created_at); "
+                         "run a full update to regenerate it")
+    records = []
+    for row in month['rows']:
+        for item in row['contributions']:
+            records.append(Contribution(
+                item['number'], item['title'], item['url'], item['created_at'],
+                row['status'], row['repo_name'], row['tech_stack'], sheet_index=len(records),
+            ))
+    return records
+
+
+def _find(snapshot, url):
+    """``(year, month)`` holding the PR at ``url`` in ``snapshot``, or None."""
+    for year in snapshot.get('years', []):
+        for month in year['months']:
+            for row in month['rows']:
+                if any(canonical_pr_url(item['url']) == url for item in row['contributions']):
+                    return year, month
+    return None
+
+
+def apply_event(snapshot, payload, allowed_statuses=None):
+    """Patch the PR of a ``pull_request`` ``payload`` into ``snapshot`` in place.
+
+    A PR whose new status is not in ``allowed_statuses`` (None: all) is
+    removed, as a full run would. Returns True if the snapshot changed;
+    raises ``ValueError`` if the PR's month cannot be regrouped.
+    """
+    details = pr_from_event(payload)
+    if details is None:
+        print(f"Skipping event: not a pull_request payload (action: {payload.get('action')}).")
+        return False
+    url = canonical_pr_url(details['url'])
+    found = _find(snapshot, url)
+    if found is None:
+        print(f"Skipping {url} (not in the snapshot)")
+        return False
+
+    year, month = found
+    records = _month_records(month)
+    index = next(i for i, record in enumerate(records) if canonical_pr_url(record.url) == url)
+    old = records[index]
+    status = pr_status(details)
+    if allowed_statuses is not None and status not in allowed_statuses:
+        print(f"Removing {url} (Status: {status} not in allowed list)")
+        del records[index]
+    elif (details['title'], status) == (old.title, old.status):
+        print(f"{url} is already up to date")
+        return False
+    else:
+        print(f"Updating {url} ({old.status} -> {status})")
+        records[index] = Contribution(
+            old.number, details['title'], old.url, old.created_at,
+            status, old.repo_name, old.tech_stack, old.sheet_index,
+        )
+
+    month['rows'] = [snapshot_row(row) for row in build_month_rows(records)]
+    if not month['rows']:
+        year['months'].remove(month)
+    if not year['months']:
+        snapshot['years'].remove(year)
+    return True
@@ -1,73 +1,246 @@
-"""GitHub data fetching via the ``gh`` CLI."""
+"""GitHub data fetching (GraphQL over a pluggable transport, ``gh`` CLI by default)."""
 
 import json
-import subprocess
+import threading
+from collections import Counter
 from urllib.parse import urlparse
 
-from .config import GITHUB_HOST, is_github_url
+from .cache import LoadingCache
+from .config import GITHUB_HOST, PR_BATCH_SIZE, TOPIC_MAP, is_github_url, parse_pr_url
+from . import tracing
+from .ratelimit import RATE_LIMIT_FIELDS
+from .transport import GhTransport, TransportError
 
-repo_cache = {}
+# Active transport; replaced via ``set_transport`` (e.g. ``--transport http``).
+transport = GhTransport()
+
+# Repo metadata keyed by "owner/repo"; safe to share between fetch workers.
+repo_cache = LoadingCache()
+
+# Final outcome of every PR requested this run: 'fetched', 'retried'
+# (fetched after at least one retry), 'failed' or 'gone' (GitHub reports it
+# does not exist, e.g. the PR or its repository was deleted).
+outcomes = {}
+_outcomes_lock = threading.Lock()
+
+# Fields requested for each PR; mirrors the ``gh pr view --json`` field list.
+PR_FIELDS = "title url state createdAt number isDraft"
+
+# Repo fields requested alongside each PR; mirrors ``gh repo view --json``.
+REPO_FIELDS = (
+    "nameWithOwner description primaryLanguage { name } "
+    "repositoryTopics(first: 100) { nodes { topic { name } } }"
+)
+
+
+# Raw repository fields kept on PR details as ``repo_node`` (input of ``_repo_info``).
+REPO_NODE_FIELDS = ("description", "primaryLanguage", "repositoryTopics")
+
+
+def set_transport(new_transport):
+    """Route all GitHub requests through ``new_transport``."""
+    global transport
+    transport = new_transport
+
+
+def set_deadline(seconds):
+    """Make the active transport finish every call within ``seconds`` (None: no limit).
+
+    A no-op for transports without deadline support (``set_deadline``).
+    """
+    set_transport_deadline = getattr(transport, 'set_deadline', None)
+    if set_transport_deadline:
+        set_transport_deadline(seconds)
+
+
+def _record_outcomes(urls, outcome):
+    with _outcomes_lock:
+        for url in urls:
+            outcomes[url] = outcome
+
+
+def outcome_summary():
+    """``{'fetched': n, 'retried': n, 'failed': n, 'gone': n}`` over all PRs requested so far."""
+    with _outcomes_lock:
+        counts = Counter(outcomes.values())
+    return {outcome: counts[outcome] for outcome in ('fetched', 'retried', 'failed', 'gone')}
+
+
+def _attempts():
+    """Requests the transport made for this thread's last query (1 without retries)."""
+    last_attempts = getattr(transport, 'last_attempts', None)
+    return last_attempts() if last_attempts else 1
+
+
+def _attach_repository(data, url):
+    """Set ``data['repository']`` from the owner/repo segments of ``url``."""
+    parsed = urlparse(url)
+    path_parts = parsed.path.strip("/").split("/")
+    if len(path_parts) >= 2:
+        data['repository'] = {'nameWithOwner': f"{path_parts[0]}/{path_parts[1]}"}
+    else:
+        data['repository'] = {'nameWithOwner': "unknown/unknown"}
+    return data
 
 
 def get_pr_details(url):
-    """Fetch PR metadata (title, url, state, date, number, draft) via ``gh pr view``."""
-    if not is_github_url(url):
-        return None
+    """Fetch PR metadata (title, url, state, date, number, draft, repo info)."""
+    return get_pr_details_batch([url], batch_size=1).get(url)
+
+
+def _repo_info(data):
+    """Build ``{description, tech_stack}`` from a GraphQL repository node (or ``repo_node``)."""
+    language = data.get('primaryLanguage', {}).get('name', '') if data.get('primaryLanguage') else ''
+    topic_nodes = (data.get('repositoryTopics') or {}).get('nodes') or []
+    topics = [t['topic']['name'] for t in topic_nodes if t.get('topic')]
+
+    tech_stack = [language] if language else []
+    for t in topics:
+        name = TOPIC_MAP.get(t)
+        if name and name not in tech_stack:
+            tech_stack.append(name)
 
+    return {
+        'description': data.get('description', ''),
+        'tech_stack': ", ".join(tech_stack),
+    }
+
+
+def _pr_batch_query(keys):
+    """Build one aliased GraphQL query (``pr0``, ``pr1``, ...) for ``keys``.
+
+    Each alias also selects the repository metadata, so no separate
+    repo lookup is needed for the PR's repo.
+    """
+    parts = [
+        f"  pr{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+        f"{{ {REPO_FIELDS} pullRequest(number: {number}) {{ {PR_FIELDS} }} }}"
+        for i, (owner, repo, number) in enumerate(keys)
+    ]
+    parts.append(f"  {RATE_LIMIT_FIELDS}")
+    return "query {\n" + "\n".join(parts) + "\n}"
+
+
+def _not_found(error):
+    """Whether a GraphQL ``error`` says the requested node does not exist."""
+    return (error.get('type') == 'NOT_FOUND'
+            or error.get('message', '').startswith('Could not resolve to'))
+
+
+def _run_pr_batch(batch, results):
+    """Fetch one batch of ``(url, key)`` pairs and store details into ``results``."""
     try:
-        cmd = [
-            "gh", "pr", "view", url,
-            "--json", "title,url,state,createdAt,number,isDraft",
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-
-        parsed = urlparse(url)
-        path_parts = parsed.path.strip("/").split("/")
-        if len(path_parts) >= 2:
-            data['repository'] = {'nameWithOwner': f"{path_parts[0]}/{path_parts[1]}"}
+        with tracing.span("graphql pr batch", "github", urls=[url for url, _ in batch]):
+            payload = transport.graphql(_pr_batch_query([k for _, k in batch]))
+    except TransportError as e:
+        for url, _ in batch:
+            print(f"Error fetching {url}: {e}")
+            results[url] = None
+        _record_outcomes([url for url, _ in batch], 'failed')
+        return
+    except Exception as e:
+        for url, _ in batch:
+            print(f"Error processing {url}: {e}")
+            results[url] = None
+        _record_outcomes([url for url, _ in batch], 'failed')
+        return
+    fetched = 'retried' if _attempts() > 1 else 'fetched'
+
+    errors = {}
+    default_error = {'message': 'pull request not found'}
+    for error in payload.get('errors') or []:
+        path = error.get('path') or []
+        if path:
+            errors.setdefault(path[0], error)
         else:
-            data['repository'] = {'nameWithOwner': "unknown/unknown"}
+            default_error = error
 
-        return data
-    except subprocess.CalledProcessError as e:
-        print(f"Error fetching {url}: {e.stderr}")
-        return None
-    except Exception as e:
-        print(f"Error processing {url}: {e}")
-        return None
+    data = payload.get('data') or {}
+    for i, (url, _) in enumerate(batch):
+        alias = f"pr{i}"
+        repo = data.get(alias) or {}
+        node = repo.get('pullRequest')
+        if node is None:
+            results[url] = None
+            error = errors.get(alias)
+            # A resolved repo without the PR, or a NOT_FOUND error for this
+            # alias, means the PR is gone; anything else may succeed next run.
+            if (error is None and alias in data) or (error is not None and _not_found(error)):
+                message = (error or default_error).get('message', 'not found')
+                print(f"Warning: {url} no longer exists on GitHub ({message}); dropping it.")
+                _record_outcomes([url], 'gone')
+            else:
+                print(f"Error fetching {url}: {(error or default_error).get('message', 'unknown error')}")
+                _record_outcomes([url], 'failed')
+            continue
+
+        details = _attach_repository(dict(node), url)
+        repo_name = repo.get('nameWithOwner')
+        if repo_name:
+            info = _repo_info(repo)
+            details['repository'] = {'nameWithOwner': repo_name}
+            # Raw repo fields travel with the PR (and into the PR cache) so the
+            # tech stack can be re-derived from the current TOPIC_MAP later.
+            details['repo_node'] = {key: repo.get(key) for key in REPO_NODE_FIELDS}
+            details['repo_info'] = info
+            repo_cache.put(repo_name, info)
+        results[url] = details
+        _record_outcomes([url], fetched)
+
+
+def get_pr_details_batch(urls, batch_size=PR_BATCH_SIZE):
+    """Fetch PR metadata for many URLs via aliased GraphQL queries.
+
+    Returns a dict mapping each URL to the same shape ``get_pr_details``
+    produces (or ``None`` on failure).
+    """
+    results = {}
+    pending = []
+    seen = set()
+    for url in urls:
+        if url in seen:
+            continue
+        seen.add(url)
+        if not is_github_url(url):
+            results[url] = None
+            continue
+        key = parse_pr_url(url)
+        if key is None:
+            print(f"Error processing {url}: not a pull request URL")
+            results[url] = None
+            continue
+        pending.append((url, key))
+
+    for start in range(0, len(pending), batch_size):
+        _run_pr_batch(pending[start:start + batch_size], results)
+
+    return results
+
+
+def _fetch_repo_details(repo_name):
+    owner, _, name = repo_name.partition("/")
+    query = (
+        f"query {{ repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+        f"{{ {REPO_FIELDS} }} {RATE_LIMIT_FIELDS} }}"
+    )
+    with tracing.span("graphql repo", "github", repo=repo_name):
+        payload = transport.graphql(query)
+    repo = (payload.get('data') or {}).get('repository')
+    if repo is None:
+        errors = payload.get('errors') or [{}]
+        raise TransportError(errors[0].get('message', 'repository not found'))
+    return _repo_info(repo)
+
+
+def _repo_details_fallback(repo_name, error):
+    print(f"Error fetching repo info for {repo_name}: {error}")
+    return {'description': '', 'tech_stack': ''}
 
 
 def get_repo_details(repo_name):
-    """Fetch repo description and tech stack via ``gh repo view`` (cached)."""
-    if repo_name in repo_cache:
-        return repo_cache[repo_name]
+    """Fetch repo description and tech stack (cached).
 
-    try:
-        cmd = [
-            "gh", "repo", "view", repo_name,
-            "--json", "description,primaryLanguage,repositoryTopics",
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-
-        language = data.get('primaryLanguage', {}).get('name', '') if data.get('primaryLanguage') else ''
-        topics_data = data.get('repositoryTopics')
-        topics = [t['name'] for t in topics_data] if topics_data else []
-
-        tech_stack = [language] if language else []
-        for t in topics:
-            from .config import TOPIC_MAP
-            name = TOPIC_MAP.get(t)
-            if name and name not in tech_stack:
-                tech_stack.append(name)
-
-        info = {
-            'description': data.get('description', ''),
-            'tech_stack': ", ".join(tech_stack),
-        }
-        repo_cache[repo_name] = info
-        return info
-    except Exception as e:
-        print(f"Error fetching repo info for {repo_name}: {e}")
-        return {'description': '', 'tech_stack': ''}
+    Concurrent lookups of the same repo share one ``gh`` call, and failures
+    are remembered for ``REPO_NEGATIVE_TTL`` seconds.
+    """
+    return repo_cache.get_or_load(repo_name, _fetch_repo_details, _repo_details_fallback)
@@ -1,7 +1,13 @@
 """Data assembly: grouping raw PRs into a render-ready model."""
 
+import calendar
+import hashlib
+import json
+import os
 import re
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from itertools import groupby
 
@@ -11,10 +17,21 @@ from .config import (
     DEFAULT_PR_EMOJI,
     DEFAULT_STATUS_ICON,
     KEYWORD_EMOJI,
+    RECENT_PR_DAYS,
     STATUS_ICONS,
     STATUS_LEGEND,
+    TERMINAL_STATUSES,
+    TOPIC_MAP,
+    canonical_pr_url,
 )
-from .github import get_pr_details, get_repo_details
+from . import columnar
+from .cache import pr_status
+from .github import (
+    _repo_info, get_pr_details, get_pr_details_batch, get_repo_details, outcomes, set_deadline,
+)
+
+
+GROUPING_BACKENDS = ("python", "columnar")
 
 
 def get_pr_emoji(title):
@@ -34,50 +51,460 @@ def get_pr_emoji(title):
     return DEFAULT_PR_EMOJI
 
 
-def fetch_urls(url_data, allowed_statuses=None):
-    """Fetch PR details and group them by year -> month."""
-    contributions_by_date = defaultdict(lambda: defaultdict(list))
-    featured_repos = {}
+class Contribution:
+    """One PR reduced to the fields the model renders.
+
+    Derived values (epoch timestamp, year/month, normalized repo and status
+    keys, tech stack) are computed once at ingest instead of inside every
+    sort/group key.
+    """
+
+    __slots__ = (
+        'number', 'title', 'url', 'created_at', 'timestamp', 'year', 'month', 'month_name',
+        'status', 'repo_name', 'repo_key', 'tech_stack', 'sheet_index',
+    )
+
+    def __init__(self, number, title, url, created_at, status, repo_name, tech_stack='', sheet_index=0):
+        created = datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ")
+        self.number = number
+        self.title = title
+        self.url = url
+        self.created_at = created_at
+        self.timestamp = calendar.timegm(created.timetuple())
+        self.year = created.year
+        self.month = created.month
+        self.month_name = created.strftime("%B")
+        self.status = status.upper()
+        self.repo_name = repo_name
+        self.repo_key = repo_name.lower()
+        self.tech_stack = tech_stack
+        self.sheet_index = sheet_index
+
+    @classmethod
+    def from_details(cls, details):
+        """Build a record from a ``get_pr_details``-shaped dict."""
+        return cls(
+            number=details['number'],
+            title=details['title'],
+            url=details['url'],
+            created_at=details['createdAt'],
+            status=details.get('status', 'OPEN'),
+            repo_name=(details.get('repository') or {}).get('nameWithOwner') or "unknown/unknown",
+            tech_stack=(details.get('repo_info') or {}).get('tech_stack', ''),
+            sheet_index=details.get('sheet_index', 0),
+        )
+
+    def __repr__(self):
+        return f"Contribution({self.repo_name}#{self.number}, {self.status}, {self.created_at})"
+
+
+def _as_contributions(prs):
+    return [pr if isinstance(pr, Contribution) else Contribution.from_details(pr) for pr in prs]
 
-    for entry in url_data:
+
+def _prefetch_details(urls, batch_size=None, workers=None, allowed_statuses=None):
+    """Fetch PR details for ``urls`` up front; returns ``{url: details}``.
+
+    ``batch_size`` packs PRs into aliased GraphQL queries; ``workers`` runs
+    up to that many requests (single PRs or whole batches) concurrently.
+    Repo details for surviving PRs whose fetch did not already include them
+    are warmed in the same pool.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    workers = max(1, workers or 1)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if batch_size:
+            chunks = [unique_urls[i:i + batch_size] for i in range(0, len(unique_urls), batch_size)]
+            prefetched = {}
+            for chunk_results in pool.map(lambda chunk: get_pr_details_batch(chunk, batch_size), chunks):
+                prefetched.update(chunk_results)
+        else:
+            prefetched = dict(zip(unique_urls, pool.map(get_pr_details, unique_urls)))
+
+        repo_names = {
+            details['repository'].get('nameWithOwner')
+            for details in prefetched.values()
+            if details and 'repository' in details and 'repo_info' not in details
+            and (allowed_statuses is None or pr_status(details) in allowed_statuses)
+        }
+        list(pool.map(get_repo_details, sorted(name for name in repo_names if name)))
+
+    return prefetched
+
+
+def _windows(items, size):
+    """Yield consecutive lists of up to ``size`` items from any iterable."""
+    window = []
+    for item in items:
+        window.append(item)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+def _fetch_window(window, allowed_statuses, batch_size, workers, cache):
+    """Details (or None) for every entry of ``window``, from ``cache`` or GitHub."""
+    cached = {}
+    if cache is not None:
+        for entry in window:
+            url = entry['url']
+            if url not in cached:
+                cached[url] = cache.get(url)
+
+    prefetched = None
+    if batch_size or (workers and workers > 1):
+        to_fetch = [entry['url'] for entry in window if cached.get(entry['url']) is None]
+        prefetched = _prefetch_details(to_fetch, batch_size, workers, allowed_statuses)
+        if cache is not None:
+            for url, details in prefetched.items():
+                if details:
+                    cache.put(url, details)
+
+    results = []
+    for entry in window:
         url = entry['url']
-        is_featured = entry.get('featured', False)
-        featured_order = entry.get('featured_order', float('inf'))
-        sheet_index = entry.get('sheet_index', 0)
+        if cached.get(url):
+            details = dict(cached[url])
+        elif prefetched is not None:
+            details = prefetched.get(url)
+            # Prefetched results are shared between duplicate rows; mutate a copy.
+            details = dict(details) if details else None
+        else:
+            details = get_pr_details(url)
+            if cache is not None and details:
+                cache.put(url, details)
+                cached[url] = dict(details)
+        results.append(details)
+    return results
+
+
+def _to_record(entry, details, allowed_statuses, featured_repos):
+    """Turn one sheet entry's details into a ``Contribution`` (None if skipped)."""
+    url = entry['url']
+    print(f"Processing {url}...")
+    if not details:
+        return None
 
-        print(f"Processing {url}...")
-        details = get_pr_details(url)
-        if details:
-            status = 'DRAFT' if details.get('isDraft') else details['state'].upper()
+    status = pr_status(details)
+    if allowed_statuses is not None and status not in allowed_statuses:
+        print(f"Skipping {url} (Status: {status} not in allowed list)")
+        return None
 
-            if allowed_statuses is not None and status not in allowed_statuses:
-                print(f"Skipping {url} (Status: {status} not in allowed list)")
+    details['status'] = status
+    details['sheet_index'] = entry.get('sheet_index', 0)
+
+    if 'repository' in details:
+        repo_name = details['repository'].get('nameWithOwner')
+        if repo_name:
+            if details.get('repo_node') is not None:
+                details['repo_info'] = _repo_info(details['repo_node'])
+            elif 'repo_info' not in details:
+                details['repo_info'] = get_repo_details(repo_name)
+            if entry.get('featured', False) and featured_repos is not None:
+                featured_order = entry.get('featured_order', float('inf'))
+                current_order = featured_repos.get(repo_name, float('inf'))
+                if repo_name not in featured_repos or featured_order < current_order:
+                    featured_repos[repo_name] = featured_order
+
+    return Contribution.from_details(details)
+
+
+def iter_contributions(url_data, allowed_statuses=None, batch_size=None, workers=None, cache=None,
+                       featured_repos=None, fallback=None, stale=None):
+    """Yield a ``Contribution`` for every fetched, allowed PR in ``url_data`` order.
+
+    ``url_data`` may be any iterable and is consumed one window at a time:
+    with ``batch_size`` or ``workers`` set, up to ``batch_size * workers``
+    entries are fetched concurrently (see ``_prefetch_details``), turned into
+    records and released before the next window is read, so raw PR details
+    never accumulate for the whole sheet. ``cache`` (a ``PRCache``) is
+    consulted before fetching and updated after. Featured repos are recorded
+    in ``featured_repos`` (repo name -> lowest order) when it is given. PRs
+    whose fetch fails keep their last known details (see ``_fill_failed``).
+    """
+    window_size = max(1, batch_size or 1) * max(1, workers or 1)
+    for window in _windows(url_data, window_size):
+        fetched = _fetch_window(window, allowed_statuses, batch_size, workers, cache)
+        _fill_failed(window, fetched, cache, fallback, stale)
+        for entry, details in zip(window, fetched):
+            record = _to_record(entry, details, allowed_statuses, featured_repos)
+            if record is not None:
+                yield record
+
+
+def _last_known(url, cache, fallback):
+    """``(details, source)`` last recorded for ``url``, ignoring cache expiry.
+
+    A cached entry without repo fields borrows the snapshot's ``repo_info``,
+    so using it needs no repo lookup.
+    """
+    snapshot = fallback.get(canonical_pr_url(url))
+    if cache is not None:
+        details = cache.peek(url)
+        if details is not None:
+            if 'repo_node' not in details and 'repo_info' in (snapshot or {}):
+                details.setdefault('repo_info', snapshot['repo_info'])
+            return details, 'cache'
+    details = snapshot
+    if details is not None:
+        return dict(details), 'snapshot'
+    return None, None
+
+
+def _fill_failed(entries, fetched, cache, fallback, stale):
+    """Replace failed fetches (None in ``fetched``) with the PR's last known details.
+
+    Each such PR is reported in ``stale`` with reason ``'failed'``; one with
+    no last known details stays None and is reported as ``'missing'``. PRs
+    GitHub reports as gone stay None: their last known details are not kept.
+    """
+    for i, entry in enumerate(entries):
+        if fetched[i] is not None or outcomes.get(entry['url']) == 'gone':
+            continue
+        fetched[i], source = _last_known(entry['url'], cache, fallback or {})
+        if stale is not None:
+            stale.append({'url': entry['url'], 'source': source or 'missing', 'reason': 'failed'})
+
+
+def _volatility(details, now):
+    """Fetch priority (lower first) of a PR last seen as ``details``.
+
+    New PRs come first, then OPEN/DRAFT ones, then PRs created within
+    ``RECENT_PR_DAYS``; older MERGED/CLOSED PRs go last.
+    """
+    if details is None:
+        return (0, 0)
+    created = calendar.timegm(datetime.strptime(details['createdAt'], "%Y-%m-%dT%H:%M:%SZ").timetuple())
+    if pr_status(details) not in TERMINAL_STATUSES:
+        return (1, -created)
+    if now - created < RECENT_PR_DAYS * 86400:
+        return (2, -created)
+    return (3, -created)
+
+
+def _budgeted_records(url_data, budget, allowed_statuses, batch_size, workers, cache, fallback,
+                      featured_repos, stale, clock):
+    """``Contribution`` records for ``url_data``, fetching most volatile PRs first.
+
+    Windows are fetched in priority order (see ``_volatility``) while the
+    budget allows another window as long as the slowest one so far; the
+    remaining entries, and those whose fetch fails, use their last known
+    details from ``cache`` or ``fallback`` and are reported in ``stale``. The transport gets the same
+    deadline, so a window already running cannot overrun it through retries,
+    backoff or slow calls. Records come back in ``url_data`` order.
+    """
+    deadline = clock() + budget
+    entries = list(url_data)
+    known = [_last_known(entry['url'], cache, fallback) for entry in entries]
+    now = time.time()
+    order = sorted(range(len(entries)), key=lambda i: _volatility(known[i][0], now))
+
+    details_at = [None] * len(entries)
+    window_size = max(1, batch_size or 1) * max(1, workers or 1)
+    slowest = 0.0
+    set_deadline(budget)
+    try:
+        for window in _windows(order, window_size):
+            started = clock()
+            if started + slowest > deadline:
+                for i in window:
+                    details, source = known[i]
+                    details_at[i] = details
+                    stale.append({'url': entries[i]['url'], 'source': source or 'missing',
+                                  'reason': 'budget'})
                 continue
+            window_entries = [entries[i] for i in window]
+            fetched = _fetch_window(window_entries, allowed_statuses, batch_size, workers, cache)
+            _fill_failed(window_entries, fetched, cache, fallback, stale)
+            for i, details in zip(window, fetched):
+                details_at[i] = details
+            slowest = max(slowest, clock() - started)
+        # Repo lookups for last known details still count against the budget.
+        records = []
+        for entry, details in zip(entries, details_at):
+            record = _to_record(entry, details, allowed_statuses, featured_repos)
+            if record is not None:
+                records.append(record)
+    finally:
+        set_deadline(None)
+    return records
+
 
-            details['status'] = status
-            details['sheet_index'] = sheet_index
+def group_contributions(records):
+    """Group ``Contribution`` records into ``{year: {(month, month_name): [records]}}``."""
+    contributions_by_date = defaultdict(lambda: defaultdict(list))
+    for record in records:
+        contributions_by_date[record.year][(record.month, record.month_name)].append(record)
+    return contributions_by_date
+
+
+def fetch_urls(url_data, allowed_statuses=None, batch_size=None, workers=None, cache=None,
+               budget=None, fallback=None, stale=None, clock=time.monotonic):
+    """Fetch PR details and group them by year -> month as ``Contribution`` records.
 
-            created_at = datetime.strptime(details['createdAt'], "%Y-%m-%dT%H:%M:%SZ")
-            year = created_at.year
-            month_name = created_at.strftime("%B")
-            month_sort = created_at.month
+    With ``batch_size`` set, PRs are fetched through aliased GraphQL queries
+    of that size instead of one query per URL. With ``workers`` set, up to
+    that many fetches run concurrently; results are still merged in
+    ``url_data`` order, so the output matches the serial path.
 
-            if 'repository' in details:
-                repo_name = details['repository'].get('nameWithOwner')
-                if repo_name:
-                    details['repo_info'] = get_repo_details(repo_name)
-                    if is_featured:
-                        current_order = featured_repos.get(repo_name, float('inf'))
-                        if repo_name not in featured_repos or featured_order < current_order:
-                            featured_repos[repo_name] = featured_order
+    PRs whose fetch fails (even after retries) reuse their last known
+    details from ``cache`` (regardless of TTL) or ``fallback`` (``{url:
+    details}``, e.g. from ``cache.details_from_snapshot``) instead of
+    dropping out. With ``budget`` (seconds), new and OPEN/DRAFT PRs are
+    fetched first and PRs still pending when the budget runs out do the
+    same. Each such PR is appended to ``stale`` as ``{url, source, reason}``:
+    ``source`` is ``'cache'``, ``'snapshot'`` or ``'missing'``, ``reason``
+    is ``'budget'`` or ``'failed'``.
 
-            contributions_by_date[year][(month_sort, month_name)].append(details)
+    Returns ``(contributions_by_date, featured_repos)``.
+    """
+    featured_repos = {}
+    fallback = {canonical_pr_url(url): details for url, details in (fallback or {}).items()}
+    stale = [] if stale is None else stale
+    if budget is None:
+        records = iter_contributions(
+            url_data, allowed_statuses, batch_size, workers, cache, featured_repos, fallback, stale,
+        )
+    else:
+        records = _budgeted_records(
+            url_data, budget, allowed_statuses, batch_size, workers, cache, fallback,
+            featured_repos, stale, clock,
+        )
+    return group_contributions(records), featured_repos
 
-    return contributions_by_date, featured_repos
 
+def _source_digest():
+    """Hash of the config/model/render/stats/assets sources, so template changes count as input."""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("config.py", "model.py", "render.py", "stats.py", "assets.py"):
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
 
-def build_readme_model(contributions_by_date, featured_repos):
-    """Build a deterministic model consumed by both renderers."""
+
+def run_fingerprint(sheet_sha256, contributions_by_date, featured_repos, options=None):
+    """Fingerprint every input that can change the generated artifacts.
+
+    Covers the sheet content hash, each fetched PR's rendered fields
+    (state, title, date, repo, tech stack), the featured repos, the
+    ``STATUS_ICONS``/``TOPIC_MAP``/``CUSTOM_LOGOS`` maps, the generator
+    sources themselves and any output ``options`` (e.g. CLI flags).
+    """
+    prs = sorted(
+        (pr.url, pr.number, pr.status, pr.title, pr.created_at, pr.repo_name, pr.tech_stack, pr.sheet_index)
+        for months in contributions_by_date.values()
+        for prs in months.values()
+        for pr in _as_contributions(prs)
+    )
+    inputs = {
+        'sheet': sheet_sha256,
+        'prs': prs,
+        'featured': sorted((repo, str(order)) for repo, order in featured_repos.items()),
+        'status_icons': STATUS_ICONS,
+        'topic_map': TOPIC_MAP,
+        'custom_logos': CUSTOM_LOGOS,
+        'source': _source_digest(),
+        'options': options or {},
+    }
+    encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _month_row(repo_name, group_status, repo_prs):
+    """Table row for one (repo, status) group of a month, newest PR first."""
+    icon = STATUS_ICONS.get(group_status, DEFAULT_STATUS_ICON)
+    owner = repo_name.split('/')[0]
+    logo_url = CUSTOM_LOGOS.get(repo_name, f"https://github.com/{owner}.png")
+
+    contributions = []
+    for pr in repo_prs:
+        emoji = get_pr_emoji(pr.title)
+        contributions.append({
+            'emoji': emoji,
+            'number': pr.number,
+            'title': pr.title,
+            'url': pr.url,
+            'created_at': pr.created_at,
+            'markdown': f"{emoji} [#{pr.number}: {pr.title}]({pr.url})",
+        })
+
+    return {
+        'status': group_status,
+        'status_icon': icon,
+        'repo_name': repo_name,
+        'repo_url': f"https://github.com/{repo_name}",
+        'logo_url': logo_url,
+        'tech_stack': repo_prs[0].tech_stack,
+        'contributions': contributions,
+        'contribution_markdown': "<br>".join(item['markdown'] for item in contributions),
+    }
+
+
+def build_month_rows(prs):
+    """Sort and group one month's ``Contribution`` records into table rows."""
+    prs = sorted(prs, key=lambda pr: (pr.repo_key, pr.status, -pr.timestamp, pr.sheet_index))
+
+    month_rows = []
+    grouped = groupby(prs, key=lambda pr: (pr.repo_key, pr.status))
+
+    for (repo_name, group_status), repo_prs in grouped:
+        repo_prs_list = list(repo_prs)
+        newest_at = max(pr.timestamp for pr in repo_prs_list)
+        month_rows.append((newest_at, _month_row(repo_name, group_status, repo_prs_list)))
+
+    month_rows.sort(key=lambda item: item[0], reverse=True)
+    return [row for _, row in month_rows]
+
+
+def _build_rows(months, backend):
+    """Build the rows of every month in ``months`` (lists of records) with ``backend``."""
+    if backend == "columnar":
+        return [
+            [_month_row(group[0].repo_key, group[0].status, group) for group in groups]
+            for groups in columnar.group_months(months)
+        ]
+    return [build_month_rows(prs) for prs in months]
+
+
+def _render_config_digest():
+    """Hash of everything besides the PRs that shapes a rendered month."""
+    inputs = {
+        'status_icons': STATUS_ICONS,
+        'default_status_icon': DEFAULT_STATUS_ICON,
+        'custom_logos': CUSTOM_LOGOS,
+        'conventional_emoji': CONVENTIONAL_EMOJI,
+        'keyword_emoji': KEYWORD_EMOJI,
+        'default_pr_emoji': DEFAULT_PR_EMOJI,
+        'source': _source_digest(),
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def month_key(config_digest, year, month_number, month_name, prs):
+    """Content hash of one month's input contributions (in input order)."""
+    digest = hashlib.sha256(f"{config_digest}|{year}|{month_number}|{month_name}".encode('utf-8'))
+    for pr in prs:
+        digest.update(json.dumps(
+            [pr.number, pr.title, pr.url, pr.created_at, pr.status, pr.repo_name,
+             pr.tech_stack, pr.sheet_index],
+            ensure_ascii=False,
+        ).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_readme_model(contributions_by_date, featured_repos, memo=None, backend="python"):
+    """Build a deterministic model consumed by both renderers.
+
+    With ``memo`` (a ``cache.RenderMemo``), each month's rows are looked up
+    under a content hash of its contributions and only rebuilt on a miss.
+    Months and years then carry a ``key`` the renderers use to splice in
+    cached fragments. ``backend`` (one of ``GROUPING_BACKENDS``) selects how
+    rows are grouped: per-month Python sorts, or ``columnar.group_months``.
+    """
     featured_projects = []
     if featured_repos:
         sorted_featured = sorted(featured_repos.items(), key=lambda item: (item[1], item[0].lower()))
@@ -90,7 +517,10 @@ def build_readme_model(contributions_by_date, featured_repos):
                 'avatar_url': f"https://github.com/{owner}.png",
             })
 
+    config_digest = _render_config_digest() if memo is not None else None
+
     years = []
+    pending = []
     for year in sorted(contributions_by_date.keys(), reverse=True):
         months = []
         sorted_months = sorted(
@@ -98,67 +528,97 @@ def build_readme_model(contributions_by_date, featured_repos):
         )
 
         for month_sort, month_name in sorted_months:
-            prs = list(contributions_by_date[year][(month_sort, month_name)])
-            prs.sort(key=lambda x: (
-                x['repository']['nameWithOwner'].lower(),
-                x.get('status', 'OPEN').upper(),
-                -datetime.strptime(x['createdAt'], "%Y-%m-%dT%H:%M:%SZ").timestamp(),
-                x.get('sheet_index', 0),
-            ))
-
-            month_rows = []
-            grouped = groupby(prs, key=lambda x: (
-                x['repository']['nameWithOwner'].lower(), x.get('status', 'OPEN').upper()
-            ))
-
-            for (repo_name, group_status), repo_prs in grouped:
-                repo_prs_list = list(repo_prs)
-                first_pr = repo_prs_list[0]
-
-                icon = STATUS_ICONS.get(group_status, DEFAULT_STATUS_ICON)
-                tech_stack = first_pr.get('repo_info', {}).get('tech_stack', '')
-                owner = repo_name.split('/')[0]
-                logo_url = CUSTOM_LOGOS.get(repo_name, f"https://github.com/{owner}.png")
+            prs = _as_contributions(contributions_by_date[year][(month_sort, month_name)])
+            month = {
+                'month_number': month_sort,
+                'month_name': month_name,
+                'rows': None,
+            }
+            if memo is not None:
+                month['key'] = month_key(config_digest, year, month_sort, month_name, prs)
+            pending.append((month, prs))
+            months.append(month)
+
+        year_data = {'year': year, 'months': months}
+        if memo is not None:
+            year_data['key'] = hashlib.sha256(
+                f"{year}|{'|'.join(month['key'] for month in months)}".encode('utf-8')
+            ).hexdigest()
+        years.append(year_data)
+
+    # Rows for every month that is not memoized are built in one pass, so
+    # the columnar backend sorts all of them together.
+    to_build = [prs for month, prs in pending if memo is None or month['key'] not in memo]
+    built = iter(_build_rows(to_build, backend))
+    for month, prs in pending:
+        if memo is None:
+            month['rows'] = next(built)
+        else:
+            month['rows'] = memo.get_or_build(month['key'], lambda: next(built))
+
+    return {
+        'title': 'OSS Contributions',
+        'featured_projects': featured_projects,
+        'years': years,
+        'status_legend': STATUS_LEGEND,
+    }
+
 
+def model_from_snapshot(snapshot):
+    """Rehydrate a ``README_DATA.json`` snapshot into the render model shape.
+
+    Row order and grouping are taken from the snapshot as-is; everything
+    derived from config (status icons, logos, PR emoji, legend) is
+    recomputed, so presentation changes apply without any network access.
+    """
+    featured_projects = [
+        {
+            'repo_name': project['repo_name'],
+            'order': project['order'],
+            'repo_url': f"https://github.com/{project['repo_name']}",
+            'avatar_url': f"https://github.com/{project['repo_name'].split('/')[0]}.png",
+        }
+        for project in snapshot.get('featured_projects', [])
+    ]
+
+    years = []
+    for year_data in snapshot.get('years', []):
+        months = []
+        for month_data in year_data['months']:
+            rows = []
+            for row in month_data['rows']:
+                repo_name = row['repo_name']
+                owner = repo_name.split('/')[0]
                 contributions = []
-                for pr in repo_prs_list:
-                    emoji = get_pr_emoji(pr['title'])
+                for item in row['contributions']:
+                    emoji = get_pr_emoji(item['title'])
                     contributions.append({
                         'emoji': emoji,
-                        'number': pr['number'],
-                        'title': pr['title'],
-                        'url': pr['url'],
-                        'markdown': f"{emoji} [#{pr['number']}: {pr['title']}]({pr['url']})",
+                        'number': item['number'],
+                        'title': item['title'],
+                        'url': item['url'],
+                        'created_at': item.get('created_at'),
+                        'markdown': f"{emoji} [#{item['number']}: {item['title']}]({item['url']})",
                     })
-
-                month_rows.append({
-                    'status': group_status,
-                    'status_icon': icon,
+                rows.append({
+                    'status': row['status'],
+                    'status_icon': STATUS_ICONS.get(row['status'], DEFAULT_STATUS_ICON),
                     'repo_name': repo_name,
                     'repo_url': f"https://github.com/{repo_name}",
-                    'logo_url': logo_url,
-                    'tech_stack': tech_stack,
+                    'logo_url': CUSTOM_LOGOS.get(repo_name, f"https://github.com/{owner}.png"),
+                    'tech_stack': row['tech_stack'],
                     'contributions': contributions,
                     'contribution_markdown': "<br>".join(item['markdown'] for item in contributions),
-                    'newest_at': max(
-                        datetime.strptime(pr['createdAt'], "%Y-%m-%dT%H:%M:%SZ")
-                        for pr in repo_prs_list
-                    ),
                 })
-
-            month_rows.sort(key=lambda row: row['newest_at'], reverse=True)
-            month_rows = [{k: v for k, v in row.items() if k != 'newest_at'} for row in month_rows]
-
             months.append({
-                'month_number': month_sort,
-                'month_name': month_name,
-                'rows': month_rows,
+                'month_number': month_data['month_number'],
+                'month_name': month_data['month_name'],
+                'rows': rows,
             })
-
-        years.append({'year': year, 'months': months})
+        years.append({'year': year_data['year'], 'months': months})
 
     return {
-        'title': 'OSS Contributions',
+        'title': snapshot.get('title', 'OSS Contributions'),
         'featured_projects': featured_projects,
         'years': years,
         'status_legend': STATUS_LEGEND,
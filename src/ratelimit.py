@@ -0,0 +1,235 @@
+"""Rate-limit-aware scheduling between the fetchers and a GitHub transport."""
+
+import calendar
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from .config import (
+    FETCH_WORKERS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_QUANTILE,
+    MAX_RETRIES,
+    RATE_LIMIT_RESERVE,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+from .transport import TransportError, TransportTimeout
+
+# GraphQL selection added to queries so every response reports the budget.
+RATE_LIMIT_FIELDS = "rateLimit { remaining resetAt }"
+
+
+def _is_rate_limited(message):
+    message = message.lower()
+    return "rate limit" in message or "abuse detection" in message
+
+
+def is_retryable(error):
+    """True for timeouts, secondary rate limits, 429s and 5xx responses."""
+    if isinstance(error, TransportTimeout):
+        return True
+    if error.status is not None and (error.status >= 500 or error.status == 429):
+        return True
+    return _is_rate_limited(str(error))
+
+
+class RateLimitedTransport:
+    """Wrap a transport with budget tracking, throttling and jittered retries.
+
+    The remaining GraphQL points and reset time are read from the
+    ``rateLimit`` field of each response. Once ``remaining`` drops to
+    ``reserve`` the scheduler sleeps until the reset instead of letting
+    requests fail. Retryable errors (see ``is_retryable``) are retried up to
+    ``max_retries`` times with exponential backoff and full jitter, honouring
+    ``Retry-After`` when the server sends one.
+
+    With a deadline set (``set_deadline``), no call, retry or wait runs past
+    it: each call's timeout is capped at the time left, and a retry or
+    rate-limit wait that would overrun it is skipped.
+    """
+
+    def __init__(self, inner, reserve=RATE_LIMIT_RESERVE, max_retries=MAX_RETRIES,
+                 base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+                 sleep=time.sleep, clock=time.time, rng=random.random):
+        self.inner = inner
+        self.name = inner.name
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng
+        self.remaining = None
+        self.reset_at = None
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self.retries = 0
+        self.failures = 0
+        self.deadline = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def set_deadline(self, seconds):
+        """Finish every call within ``seconds`` from now (None: no deadline)."""
+        self.deadline = None if seconds is None else self.clock() + seconds
+
+    def _overruns(self, delay):
+        return self.deadline is not None and self.clock() + delay >= self.deadline
+
+    def _wait_for_budget(self):
+        with self._lock:
+            if self.remaining is None or self.remaining > self.reserve or self.reset_at is None:
+                return
+            delay = self.reset_at - self.clock()
+            if delay <= 0:
+                self.remaining = None
+                return
+            if self._overruns(delay):
+                return
+            self.throttled += 1
+            self.waited_seconds += delay
+        print(f"Rate limit nearly exhausted ({self.remaining} left); waiting {delay:.0f}s for reset.")
+        self.sleep(delay)
+
+    def _observe(self, payload):
+        rate = (payload.get('data') or {}).get('rateLimit')
+        if not rate:
+            return
+        try:
+            reset_at = calendar.timegm(
+                datetime.strptime(rate['resetAt'], "%Y-%m-%dT%H:%M:%SZ").timetuple()
+            )
+        except (KeyError, TypeError, ValueError):
+            reset_at = None
+        with self._lock:
+            self.remaining = rate.get('remaining')
+            self.reset_at = reset_at
+
+    def _backoff(self, attempt):
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * self.rng()
+
+    def last_attempts(self):
+        """Attempts made by this thread's most recent ``graphql`` call."""
+        return getattr(self._local, 'attempts', 0)
+
+    def graphql(self, query):
+        for attempt in range(self.max_retries + 1):
+            self._local.attempts = attempt + 1
+            self._wait_for_budget()
+            try:
+                if self.deadline is None:
+                    payload = self.inner.graphql(query)
+                elif self._overruns(0):
+                    raise TransportTimeout("fetch deadline reached")
+                else:
+                    payload = self.inner.graphql(query, timeout=self.deadline - self.clock())
+            except TransportError as e:
+                delay = e.retry_after if e.retry_after is not None else self._backoff(attempt)
+                if attempt == self.max_retries or not is_retryable(e) or self._overruns(delay):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+            else:
+                self._observe(payload)
+                errors = payload.get('errors') or []
+                limited = any(error.get('type') == 'RATE_LIMITED' for error in errors)
+                if not limited or attempt == self.max_retries:
+                    return payload
+                delay = max(0.0, (self.reset_at or 0) - self.clock()) or self._backoff(attempt)
+                if self._overruns(delay):
+                    return payload
+            with self._lock:
+                self.retries += 1
+                self.waited_seconds += delay
+            self.sleep(delay)
+
+    def stats(self):
+        return {
+            'throttled': self.throttled,
+            'waited_seconds': self.waited_seconds,
+            'retries': self.retries,
+            'failures': self.failures,
+            'remaining': self.remaining,
+        }
+
+    def close(self):
+        close = getattr(self.inner, 'close', None)
+        if close:
+            close()
+
+
+class HedgedTransport:
+    """Send a duplicate request when a call runs unusually long; first response wins.
+
+    Once ``min_samples`` calls have succeeded, a call still pending after the
+    ``quantile`` of recent latencies gets a second, identical request. The
+    slower of the two is left to finish (bounded by the transport timeout)
+    and its result discarded.
+    """
+
+    def __init__(self, inner, quantile=HEDGE_QUANTILE, min_samples=HEDGE_MIN_SAMPLES,
+                 workers=FETCH_WORKERS, clock=time.monotonic):
+        self.inner = inner
+        self.name = inner.name
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.clock = clock
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2 * max(1, workers))
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(self.quantile * len(latencies)))]
+
+    def _call(self, query, timeout=None):
+        start = self.clock()
+        payload = self.inner.graphql(query) if timeout is None else self.inner.graphql(query, timeout=timeout)
+        with self._lock:
+            self._latencies.append(self.clock() - start)
+        return payload
+
+    def graphql(self, query, timeout=None):
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._call(query, timeout)
+
+        primary = self._pool.submit(self._call, query, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        hedge = self._pool.submit(self._call, query, timeout)
+        with self._lock:
+            self.hedged += 1
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is not None:
+                if winner is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return winner.result()
+        # Both requests failed; surface the original one's error.
+        return primary.result()
+
+    def stats(self):
+        return {'hedged': self.hedged, 'hedge_wins': self.hedge_wins, 'delay': self.hedge_delay()}
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        close = getattr(self.inner, 'close', None)
+        if close:
+            close()
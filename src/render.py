@@ -1,100 +1,250 @@
-"""Renderers: markdown README and JSON snapshot."""
+"""Renderers: markdown README and JSON snapshot.
+
+Both outputs are produced by one traversal of the model (``render_model``)
+that feeds every sink; each sink assembles its output in a single buffer,
+which is then written atomically. Year and month fragments can be memoized
+across runs (``cache.RenderMemo``).
+"""
 
 import json
+import os
 
+from .config import README_FILE, SNAPSHOT_FILE, STATS_TOP_N, STATUS_LEGEND
 from .model import build_readme_model
+from .stats import build_index
 
 
-def generate_markdown(contributions_by_date, featured_repos, output_file="README.md", model=None):
-    """Render the grouped contributions into a Markdown README."""
-    if model is None:
-        model = build_readme_model(contributions_by_date, featured_repos)
+def write_if_changed(path, text):
+    """Atomically replace ``path`` with ``text`` (str or bytes) unless it already has those bytes.
+
+    Returns True when the file was (re)written.
+    """
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
 
-    with open(output_file, "w") as f:
-        f.write("# OSS Contributions\n\n")
+class MarkdownSink:
+    """README markdown; with ``stats``, a Stats section precedes the legend."""
+
+    kind = 'markdown'
+
+    def __init__(self, stats=False):
+        self.stats = stats
+        self._parts = []
+        self._write = self._parts.append
+
+    def begin(self, model):
+        w = self._write
+        w("# OSS Contributions\n\n")
 
         if model['featured_projects']:
-            f.write("## Featured Projects\n\n")
-            f.write("<p float=\"left\">\n")
+            w("## Featured Projects\n\n")
+            w("<p float=\"left\">\n")
             for project in model['featured_projects']:
                 repo = project['repo_name']
-                f.write(f"  <a href=\"{project['repo_url']}\">\n")
-                f.write(f"    <img src=\"{project['avatar_url']}\" width=\"60\" title=\"{repo}\" alt=\"{repo}\" />\n")
-                f.write("  </a>\n")
-            f.write("</p>\n\n")
-
-        for year_data in model['years']:
-            year = year_data['year']
-            f.write(f"# {year}\n\n")
-
-            for month_data in year_data['months']:
-                month_name = month_data['month_name']
-                f.write(f"## {month_name}\n\n")
-                f.write("| Status | Project | Tech Stack | Contribution |\n")
-                f.write("| :---: | :--- | :---: | :--- |\n")
-
-                for row in month_data['rows']:
-                    repo_display = (
-                        f"<a href=\"{row['repo_url']}\">"
-                        f"<img src=\"{row['logo_url']}\" width=\"24\" height=\"24\" style=\"vertical-align:middle;\"/>"
-                        "</a>"
-                    )
-                    f.write(
-                        f"| {row['status_icon']} | {repo_display} | {row['tech_stack']} | {row['contribution_markdown']} |\n"
-                    )
-
-                f.write("\n")
-
-        f.write("## Status\n\n")
+                w(f"  <a href=\"{project['repo_url']}\">\n")
+                w(f"    <img src=\"{project['avatar_url']}\" width=\"60\" title=\"{repo}\" alt=\"{repo}\" />\n")
+                w("  </a>\n")
+            w("</p>\n\n")
+
+    def render_month(self, month_data):
+        parts = [
+            f"## {month_data['month_name']}\n\n"
+            "| Status | Project | Tech Stack | Contribution |\n"
+            "| :---: | :--- | :---: | :--- |\n"
+        ]
+        for row in month_data['rows']:
+            repo_display = (
+                f"<a href=\"{row['repo_url']}\">"
+                f"<img src=\"{row['logo_url']}\" width=\"24\" height=\"24\" style=\"vertical-align:middle;\"/>"
+                "</a>"
+            )
+            parts.append(
+                f"| {row['status_icon']} | {repo_display} | {row['tech_stack']} | {row['contribution_markdown']} |\n"
+            )
+        parts.append("\n")
+        return "".join(parts)
+
+    def render_year(self, year_data, month_fragments):
+        return f"# {year_data['year']}\n\n" + "".join(month_fragments)
+
+    def add_year(self, fragment):
+        self._write(fragment)
+
+    def _stats_section(self, index):
+        w = self._write
+        total = index['total']
+        w("## Stats\n\n")
+        w(f"**{total['total']}** contributions to **{len(index['repos'])}** repositories.\n\n")
+        w("| Status | Contributions |\n| :---: | ---: |\n")
+        for item in STATUS_LEGEND:
+            if total.get(item['status']):
+                w(f"| {item['icon']} {item['label']} | {total[item['status']]} |\n")
+        w("\n| Project | Contributions |\n| :--- | ---: |\n")
+        for repo, count in index['top_repos'][:STATS_TOP_N]:
+            w(f"| [{repo}](https://github.com/{repo}) | {count} |\n")
+        if index['tech_stacks']:
+            w("\n| Tech Stack | Contributions |\n| :--- | ---: |\n")
+            techs = sorted(index['tech_stacks'].items(), key=lambda item: (-item[1]['total'], item[0]))
+            for tech, counts in techs[:STATS_TOP_N]:
+                w(f"| {tech} | {counts['total']} |\n")
+        w("\n")
+
+    def end(self, model):
+        w = self._write
+        if self.stats and model['years']:
+            self._stats_section(build_index(model))
+        w("## Status\n\n")
         for item in model['status_legend']:
-            f.write(f"- {item['icon']} **{item['label']}**: {item['description']}\n")
-        f.write("\n")
+            w(f"- {item['icon']} **{item['label']}**: {item['description']}\n")
+        w("\n")
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+
+def _dump(value, level=0):
+    """``json.dumps(indent=2)`` of ``value`` as if nested ``level`` objects deep."""
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace("\n", "\n" + "  " * level) if level else text
+
+
+def _json_list(items, indent):
+    """Join pre-indented JSON ``items`` into a list closing at ``indent``."""
+    if not items:
+        return "[]"
+    return "[\n" + ",\n".join(items) + f"\n{indent}]"
+
+
+def snapshot_row(row):
+    """The JSON snapshot form of one model row."""
+    contributions = [
+        {
+            'number': item['number'],
+            'title': item['title'],
+            'url': item['url'],
+            'created_at': item['created_at'],
+            'text': f"#{item['number']}: {item['title']}",
+        }
+        for item in row['contributions']
+    ]
+    return {
+        'status': row['status'],
+        'repo_name': row['repo_name'],
+        'repo_url': row['repo_url'],
+        'logo_url': row['logo_url'],
+        'tech_stack': row['tech_stack'],
+        'contributions': contributions,
+        'contribution_text': " | ".join(item['text'] for item in contributions),
+    }
 
 
-def generate_json_snapshot(contributions_by_date, featured_repos, output_file="README_DATA.json", model=None):
-    """Write a machine-readable snapshot of the same data shown in README."""
+class JsonSink:
+    """``README_DATA.json`` snapshot, streamed year by year.
+
+    The output is byte-identical to ``json.dump(snapshot, indent=2)`` of the
+    full document, without ever building that document in memory. The
+    document ends with the aggregate ``stats`` index (see ``stats.build_index``).
+    """
+
+    kind = 'json'
+
+    def __init__(self):
+        self._parts = []
+        self._write = self._parts.append
+        self._years = 0
+
+    def begin(self, model):
+        self._write(
+            "{\n"
+            f"  \"title\": {_dump(model['title'])},\n"
+            f"  \"featured_projects\": {_dump(model['featured_projects'], 1)},\n"
+            "  \"years\": ["
+        )
+
+    def render_month(self, month_data):
+        rows = ["            " + _dump(snapshot_row(row), 6) for row in month_data['rows']]
+        return (
+            "        {\n"
+            f"          \"month_number\": {_dump(month_data['month_number'])},\n"
+            f"          \"month_name\": {_dump(month_data['month_name'])},\n"
+            f"          \"rows\": {_json_list(rows, '          ')}\n"
+            "        }"
+        )
+
+    def render_year(self, year_data, month_fragments):
+        return (
+            "    {\n"
+            f"      \"year\": {_dump(year_data['year'])},\n"
+            f"      \"months\": {_json_list(month_fragments, '      ')}\n"
+            "    }"
+        )
+
+    def add_year(self, fragment):
+        self._write(",\n" if self._years else "\n")
+        self._write(fragment)
+        self._years += 1
+
+    def end(self, model):
+        self._write("\n  ]" if self._years else "]")
+        self._write(f",\n  \"stats\": {_dump(build_index(model), 1)}\n}}\n")
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+
+def _fragment(memo, key, sink, render):
+    if memo is None or key is None:
+        return render()
+    return memo.fragment(key, sink.kind, render)
+
+
+def render_model(model, sinks, memo=None):
+    """Walk ``model`` once, feeding every sink in ``sinks``.
+
+    With ``memo``, the rendered fragment of every keyed year/month is taken
+    from (or stored into) it, so unchanged sections are spliced in as-is.
+    """
+    for sink in sinks:
+        sink.begin(model)
+    for year_data in model['years']:
+        for sink in sinks:
+            def render_year():
+                return sink.render_year(year_data, [
+                    _fragment(memo, month_data.get('key'), sink, lambda: sink.render_month(month_data))
+                    for month_data in year_data['months']
+                ])
+            sink.add_year(_fragment(memo, year_data.get('key'), sink, render_year))
+    for sink in sinks:
+        sink.end(model)
+    return sinks
+
+
+def render_outputs(model, outputs, memo=None):
+    """Render ``{path: sink}`` in one pass; returns the paths actually rewritten."""
+    render_model(model, list(outputs.values()), memo)
+    return [path for path, sink in outputs.items() if write_if_changed(path, sink.getvalue())]
+
+
+def generate_markdown(contributions_by_date, featured_repos, output_file=README_FILE, model=None):
+    """Render the grouped contributions into a Markdown README."""
     if model is None:
         model = build_readme_model(contributions_by_date, featured_repos)
-    json_model = {
-        'title': model['title'],
-        'featured_projects': model['featured_projects'],
-        'years': [],
-    }
+    return bool(render_outputs(model, {output_file: MarkdownSink()}))
 
-    for year_data in model['years']:
-        json_year = {'year': year_data['year'], 'months': []}
-
-        for month_data in year_data['months']:
-            json_month = {
-                'month_number': month_data['month_number'],
-                'month_name': month_data['month_name'],
-                'rows': [],
-            }
-
-            for row in month_data['rows']:
-                plain_contributions = []
-                for item in row['contributions']:
-                    plain_contributions.append({
-                        'number': item['number'],
-                        'title': item['title'],
-                        'url': item['url'],
-                        'text': f"#{item['number']}: {item['title']}",
-                    })
-
-                json_month['rows'].append({
-                    'status': row['status'],
-                    'repo_name': row['repo_name'],
-                    'repo_url': row['repo_url'],
-                    'logo_url': row['logo_url'],
-                    'tech_stack': row['tech_stack'],
-                    'contributions': plain_contributions,
-                    'contribution_text': " | ".join(item['text'] for item in plain_contributions),
-                })
-
-            json_year['months'].append(json_month)
-
-        json_model['years'].append(json_year)
-
-    with open(output_file, "w") as f:
-        json.dump(json_model, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+
+def generate_json_snapshot(contributions_by_date, featured_repos, output_file=SNAPSHOT_FILE, model=None):
+    """Write a machine-readable snapshot of the same data shown in README."""
+    if model is None:
+        model = build_readme_model(contributions_by_date, featured_repos)
+    return bool(render_outputs(model, {output_file: JsonSink()}))
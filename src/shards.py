@@ -0,0 +1,195 @@
+"""Sharded snapshot layout: one file per year plus a manifest (``--shards``).
+
+The manifest (``manifest.json``) carries everything outside the years
+(title, featured projects, the ``stats`` index) and, per shard, its file
+name, SHA-256 and row/contribution counts, so consumers can load only the
+years they need and check them. Shards are encoded as
+
+    json        pretty-printed ``{year, months}`` document
+    min         the same document, minified
+    ndjson      one line per row, tagged with its year and month
+    ndjson.gz   gzip of the above (``mtime=0``, so output is reproducible)
+
+Each file goes through ``write_if_changed``: unchanged years produce no diff.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+
+from .config import SHARDS_DIR
+from .render import snapshot_row, write_if_changed
+from .stats import build_index
+
+MANIFEST_FILE = "manifest.json"
+SHARD_FORMATS = {
+    'json': ".json",
+    'min': ".min.json",
+    'ndjson': ".ndjson",
+    'ndjson.gz': ".ndjson.gz",
+}
+
+_SHARD_NAME = re.compile(r"^\d+(\.min\.json|\.json|\.ndjson|\.ndjson\.gz)$")
+
+
+def _ndjson(year_doc):
+    lines = []
+    for month in year_doc['months']:
+        for row in month['rows']:
+            line = {'year': year_doc['year'], 'month_number': month['month_number'],
+                    'month_name': month['month_name'], **row}
+            lines.append(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + "\n")
+    return "".join(lines)
+
+
+def encode_shard(year_doc, fmt):
+    """Serialize one ``{year, months}`` document as ``fmt`` bytes."""
+    if fmt == 'json':
+        return (json.dumps(year_doc, indent=2, ensure_ascii=False) + "\n").encode('utf-8')
+    if fmt == 'min':
+        return (json.dumps(year_doc, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+    data = _ndjson(year_doc).encode('utf-8')
+    if fmt == 'ndjson':
+        return data
+    out = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=out, mtime=0) as f:
+        f.write(data)
+    return out.getvalue()
+
+
+def decode_shard(data, fmt):
+    """Inverse of ``encode_shard``."""
+    if fmt in ('json', 'min'):
+        return json.loads(data)
+    if fmt == 'ndjson.gz':
+        data = gzip.decompress(data)
+    year_doc = None
+    for line in data.decode('utf-8').splitlines():
+        row = json.loads(line)
+        year = row.pop('year')
+        month_number = row.pop('month_number')
+        month_name = row.pop('month_name')
+        if year_doc is None:
+            year_doc = {'year': year, 'months': []}
+        months = year_doc['months']
+        if not months or months[-1]['month_number'] != month_number:
+            months.append({'month_number': month_number, 'month_name': month_name, 'rows': []})
+        months[-1]['rows'].append(row)
+    return year_doc
+
+
+def write_shards(model, directory=SHARDS_DIR, fmt='json'):
+    """Write ``model`` as per-year shards plus a manifest; returns the paths rewritten.
+
+    Shards of years no longer in the model (or in another format) are removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    shards = []
+    for year_data in model['years']:
+        year_doc = {
+            'year': year_data['year'],
+            'months': [
+                {
+                    'month_number': month['month_number'],
+                    'month_name': month['month_name'],
+                    'rows': [snapshot_row(row) for row in month['rows']],
+                }
+                for month in year_data['months']
+            ],
+        }
+        data = encode_shard(year_doc, fmt)
+        name = f"{year_data['year']}{SHARD_FORMATS[fmt]}"
+        path = os.path.join(directory, name)
+        if write_if_changed(path, data):
+            written.append(path)
+        rows = [row for month in year_doc['months'] for row in month['rows']]
+        shards.append({
+            'year': year_data['year'],
+            'file': name,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'rows': len(rows),
+            'contributions': sum(len(row['contributions']) for row in rows),
+        })
+
+    names = {shard['file'] for shard in shards}
+    for name in os.listdir(directory):
+        if _SHARD_NAME.match(name) and name not in names:
+            os.remove(os.path.join(directory, name))
+            written.append(os.path.join(directory, name))
+
+    manifest = {
+        'title': model['title'],
+        'featured_projects': model['featured_projects'],
+        'format': fmt,
+        'shards': shards,
+        'stats': build_index(model),
+    }
+    path = os.path.join(directory, MANIFEST_FILE)
+    if write_if_changed(path, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"):
+        written.append(path)
+    return written
+
+
+def load_shards(manifest_path, years=None, verify=True):
+    """Assemble a snapshot (``README_DATA.json`` shape) from a shard manifest.
+
+    Only the shards for ``years`` are read when given. With ``verify``, a
+    shard whose bytes do not match the manifest hash raises ``ValueError``.
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(manifest_path)
+    wanted = None if years is None else {int(year) for year in years}
+
+    snapshot_years = []
+    for shard in manifest['shards']:
+        if wanted is not None and shard['year'] not in wanted:
+            continue
+        with open(os.path.join(directory, shard['file']), "rb") as f:
+            data = f.read()
+        if verify and hashlib.sha256(data).hexdigest() != shard['sha256']:
+            raise ValueError(f"shard {shard['file']} does not match its manifest hash")
+        snapshot_years.append(decode_shard(data, manifest['format']))
+
+    return {
+        'title': manifest['title'],
+        'featured_projects': manifest['featured_projects'],
+        'years': snapshot_years,
+        'stats': manifest['stats'],
+    }
+
+
+def manifest_format(path):
+    """Shard format recorded in the manifest at ``path``; None if ``path`` is not a manifest."""
+    try:
+        with open(path) as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return document.get('format') if isinstance(document, dict) and 'shards' in document else None
+
+
+def load_snapshot(path, years=None):
+    """Load a snapshot from ``README_DATA.json`` or a shard manifest, or None.
+
+    ``years`` limits the result to those years (only their shards are read);
+    ``stats`` still covers every year.
+    """
+    try:
+        with open(path) as f:
+            document = json.load(f)
+        if 'shards' in document:
+            return load_shards(path, years)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: ignoring unreadable snapshot {path}: {e}")
+        return None
+    if years is not None:
+        wanted = {int(year) for year in years}
+        document['years'] = [year for year in document.get('years', []) if year['year'] in wanted]
+    return document
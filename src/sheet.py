@@ -1,18 +1,50 @@
 """Google Sheet CSV ingestion (URL list + allowed statuses)."""
 
 import csv
+import hashlib
 import io
+import json
+import os
+import urllib.error
 import urllib.request
 
-from .config import PR_PATH_MARKER, is_github_url
+from .config import GITHUB_HOST, PR_PATH_MARKER, canonical_pr_url, is_github_url, parse_pr_url
 
 INFINITY = float('inf')
 
 
-def _read_csv(url):
-    """Open a CSV URL and return a file-like text handle."""
-    with urllib.request.urlopen(url, timeout=30) as response:
-        return io.StringIO(response.read().decode('utf-8'))
+class _HashingStream(io.RawIOBase):
+    """Raw byte stream that feeds everything read through ``hasher``."""
+
+    def __init__(self, raw, hasher):
+        self._raw = raw
+        self._hasher = hasher
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._raw.readinto(buffer)
+        if n:
+            self._hasher.update(memoryview(buffer)[:n])
+        return n
+
+
+def _load_state(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
 
 
 def _parse_allowed(reader):
@@ -25,10 +57,42 @@ def _parse_allowed(reader):
     return allowed
 
 
+def _dedup_prs(entries):
+    """Merge ``url_data`` entries that point at the same pull request.
+
+    URLs are keyed by ``canonical_pr_url``, so ``/files`` or ``/commits``
+    suffixes, query strings, fragments and owner/repo case do not matter.
+    A PR is featured if any of its rows is, with the lowest ``FeaturedOrder``
+    among its featured rows; the first row's URL and ``sheet_index`` are kept.
+    """
+    index = {}
+    for entry in entries:
+        key = canonical_pr_url(entry['url'])
+        first = index.get(key)
+        if first is None:
+            index[key] = dict(entry)
+            continue
+        print(
+            f"Warning: Merging duplicate PR at row {entry['sheet_index'] + 2}: "
+            f"'{entry['url']}' (same as row {first['sheet_index'] + 2})"
+        )
+        if entry['featured']:
+            # Only featured rows' orders count; a non-featured row's order is ignored.
+            if first['featured']:
+                first['featured_order'] = min(first['featured_order'], entry['featured_order'])
+            else:
+                first['featured_order'] = entry['featured_order']
+            first['featured'] = True
+        first['sheet_index'] = min(first['sheet_index'], entry['sheet_index'])
+    return list(index.values())
+
+
 def _parse_sheet(reader):
     """Parse ``(url_data, allowed_statuses)`` from sheet rows.
 
-    ``url_data`` is a list of dicts: ``{url, featured, featured_order, sheet_index}``.
+    ``url_data`` is a list of dicts: ``{url, featured, featured_order, sheet_index}``,
+    one per pull request (see ``_dedup_prs``), with ``url`` in the form
+    ``https://github.com/owner/repo/pull/N``.
     """
     url_data = []
     allowed = set()
@@ -47,7 +111,8 @@ def _parse_sheet(reader):
             if not value:
                 continue
 
-            if is_github_url(value) and PR_PATH_MARKER in value:
+            key = parse_pr_url(value) if PR_PATH_MARKER in value else None
+            if is_github_url(value) and key is not None:
                 is_featured = bool(
                     row.get('Featured') and row['Featured'].upper() == 'YES'
                 )
@@ -57,8 +122,9 @@ def _parse_sheet(reader):
                         featured_order = float(row['FeaturedOrder'])
                     except ValueError:
                         pass
+                owner, repo, number = key
                 url_data.append({
-                    'url': value,
+                    'url': f"https://{GITHUB_HOST}/{owner}/{repo}/pull/{number}",
                     'featured': is_featured,
                     'featured_order': featured_order,
                     'sheet_index': i,
@@ -69,9 +135,64 @@ def _parse_sheet(reader):
                     "(must contain 'github.com' and '/pull/')"
                 )
 
-    return url_data, allowed
+    return _dedup_prs(url_data), allowed
 
 
-def fetch_urls_from_sheet(csv_url):
-    """Fetch URLs from a published Google Sheet CSV via ``urlopen``."""
-    return _parse_sheet(csv.DictReader(_read_csv(csv_url)))
+def fetch_sheet(csv_url, state_path=None):
+    """Fetch and parse a published Google Sheet CSV.
+
+    The response body is decoded and parsed as it streams in, while a SHA-256
+    of the raw bytes is computed on the side. With ``state_path`` set, the
+    previous ETag/Last-Modified are sent as a conditional request; a ``304``
+    reuses the stored ``url_data`` without downloading or parsing anything.
+
+    Returns a dict ``{url_data, allowed, sha256, unchanged}``; ``unchanged``
+    is True when the sheet content matches the previous run.
+    """
+    state = _load_state(state_path)
+    headers = {}
+    if state:
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+
+    request = urllib.request.Request(csv_url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=30)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and state:
+            return {
+                'url_data': _dedup_prs(state['url_data']),
+                'allowed': set(state['allowed']),
+                'sha256': state['sha256'],
+                'unchanged': True,
+            }
+        raise
+
+    hasher = hashlib.sha256()
+    with response:
+        stream = io.BufferedReader(_HashingStream(response, hasher))
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        url_data, allowed = _parse_sheet(csv.DictReader(text))
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+    sha256 = hasher.hexdigest()
+    unchanged = bool(state) and state.get('sha256') == sha256
+    if state_path:
+        _save_state(state_path, {
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': sha256,
+            'url_data': url_data,
+            'allowed': sorted(allowed),
+        })
+
+    return {'url_data': url_data, 'allowed': allowed, 'sha256': sha256, 'unchanged': unchanged}
+
+
+def fetch_urls_from_sheet(csv_url, state_path=None):
+    """Fetch ``(url_data, allowed_statuses)`` from a published Google Sheet CSV."""
+    result = fetch_sheet(csv_url, state_path)
+    return result['url_data'], result['allowed']
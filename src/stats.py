@@ -0,0 +1,117 @@
+"""Aggregate contribution counts, stored under ``stats`` in ``README_DATA.json``.
+
+``build_index`` walks a render model (or a snapshot, which has the same
+``years -> months -> rows`` shape) once and counts contributions by status
+along several dimensions. ``StatsIndex`` answers lookups from those
+precomputed counts without rescanning the rows.
+
+Every count is a ``{'total': n, <STATUS>: n, ...}`` dict.
+"""
+
+from collections import defaultdict
+
+
+def _counts():
+    return defaultdict(int)
+
+
+def _add(counts, status, n):
+    counts['total'] += n
+    counts[status] += n
+
+
+def _freeze(counts):
+    """Plain dict with ``total`` first and statuses in sorted order."""
+    return {'total': counts['total'], **{s: counts[s] for s in sorted(counts) if s != 'total'}}
+
+
+def tech_names(tech_stack):
+    """Split a row's ``tech_stack`` (``"Kotlin, Jetpack Compose"``) into names."""
+    return [name.strip() for name in tech_stack.split(",") if name.strip()]
+
+
+def build_index(model):
+    """Count the contributions in ``model`` by status, repo, year, month and tech stack."""
+    total = _counts()
+    repos = defaultdict(_counts)
+    repo_years = defaultdict(lambda: defaultdict(_counts))
+    years = defaultdict(_counts)
+    months = defaultdict(_counts)
+    tech_stacks = defaultdict(_counts)
+
+    for year_data in model['years']:
+        year = str(year_data['year'])
+        for month_data in year_data['months']:
+            month = f"{year}-{month_data['month_number']:02d}"
+            for row in month_data['rows']:
+                n = len(row['contributions'])
+                status = row['status']
+                repo = row['repo_name']
+                _add(total, status, n)
+                _add(repos[repo], status, n)
+                _add(repo_years[repo][year], status, n)
+                _add(years[year], status, n)
+                _add(months[month], status, n)
+                for tech in tech_names(row['tech_stack']):
+                    _add(tech_stacks[tech], status, n)
+
+    return {
+        'total': _freeze(total),
+        'repos': {repo: _freeze(repos[repo]) for repo in sorted(repos)},
+        'repo_years': {
+            repo: {year: _freeze(counts) for year, counts in sorted(repo_years[repo].items())}
+            for repo in sorted(repo_years)
+        },
+        'years': {year: _freeze(years[year]) for year in sorted(years)},
+        'months': {month: _freeze(months[month]) for month in sorted(months)},
+        'tech_stacks': {tech: _freeze(tech_stacks[tech]) for tech in sorted(tech_stacks)},
+        'top_repos': [
+            [repo, counts['total']]
+            for repo, counts in sorted(repos.items(), key=lambda item: (-item[1]['total'], item[0]))
+        ],
+    }
+
+
+class StatsIndex:
+    """Constant-time lookups over a ``build_index`` result.
+
+    ``status`` arguments are case-insensitive; ``None`` means all statuses.
+    Unknown keys count as zero.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Use the snapshot's ``stats`` key, or build it for older snapshots."""
+        return cls(snapshot.get('stats') or build_index(snapshot))
+
+    @staticmethod
+    def _get(counts, status):
+        if counts is None:
+            return 0
+        return counts.get('total' if status is None else status.upper(), 0)
+
+    def total(self, status=None):
+        return self._get(self.index['total'], status)
+
+    def repo(self, repo_name, status=None, year=None):
+        """Contributions to ``repo_name``, optionally in one ``year``."""
+        key = repo_name.lower()
+        if year is None:
+            return self._get(self.index['repos'].get(key), status)
+        return self._get(self.index['repo_years'].get(key, {}).get(str(year)), status)
+
+    def year(self, year, status=None):
+        return self._get(self.index['years'].get(str(year)), status)
+
+    def month(self, year, month, status=None):
+        return self._get(self.index['months'].get(f"{year}-{int(month):02d}"), status)
+
+    def tech(self, name, status=None):
+        return self._get(self.index['tech_stacks'].get(name), status)
+
+    def top_repos(self, n=None):
+        """``[(repo, count), ...]`` by contribution count, most first."""
+        return [tuple(item) for item in self.index['top_repos'][:n]]
@@ -0,0 +1,99 @@
+"""Lightweight span tracing with Chrome trace-event export (``--trace``)."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Collects complete (``ph: X``) trace events from any thread."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.events = []
+        self._origin = clock()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, category="run", **args):
+        """Record the duration of the ``with`` block; yields the span's ``args``."""
+        stack = self._stack()
+        stack.append(args)
+        start = self.clock()
+        try:
+            yield args
+        except BaseException as e:
+            args.setdefault('error', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            end = self.clock()
+            stack.pop()
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def annotate(self, **args):
+        """Attach ``args`` to the innermost open span on this thread."""
+        stack = self._stack()
+        if stack:
+            stack[-1].update(args)
+
+    def slowest(self, category, n):
+        """The ``n`` longest spans of ``category``, slowest first."""
+        with self._lock:
+            events = [e for e in self.events if e['cat'] == category]
+        return sorted(events, key=lambda e: e['dur'], reverse=True)[:n]
+
+    def write(self, path):
+        """Write the events as a Chrome trace-event JSON file (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e['ts'])
+        with open(path, "w") as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+            f.write("\n")
+
+
+class NullTracer:
+    """Default tracer: spans cost a context manager and nothing else."""
+
+    @contextmanager
+    def span(self, name, category="run", **args):
+        yield args
+
+    def annotate(self, **args):
+        pass
+
+
+tracer = NullTracer()
+
+
+def set_tracer(new_tracer):
+    """Install ``new_tracer`` as the process-wide tracer."""
+    global tracer
+    tracer = new_tracer
+
+
+def span(name, category="run", **args):
+    return tracer.span(name, category, **args)
+
+
+def annotate(**args):
+    tracer.annotate(**args)
@@ -0,0 +1,192 @@
+"""Transports for GitHub API requests: the ``gh`` CLI or a pooled HTTPS client."""
+
+import http.client
+import json
+import os
+import queue
+import re
+import subprocess
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from . import tracing
+from .config import FETCH_WORKERS, GITHUB_API_URL, REQUEST_TIMEOUT
+
+
+class TransportError(Exception):
+    """A GitHub request failed.
+
+    ``status`` is the HTTP status and ``retry_after`` the server-requested
+    delay in seconds, when known.
+    """
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TransportTimeout(TransportError):
+    """A GitHub request did not complete within the transport's timeout."""
+
+
+class GhTransport:
+    """Send GraphQL queries through ``gh api graphql`` (one subprocess per call).
+
+    A ``gh`` process still running after ``timeout`` seconds is killed.
+    """
+
+    name = "gh"
+
+    def __init__(self, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+
+    def graphql(self, query, timeout=None):
+        """Run ``query`` and return the decoded response payload.
+
+        ``timeout`` lowers the configured timeout for this call only.
+        """
+        timeout = self.timeout if timeout is None else min(self.timeout, timeout)
+        cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, check=True, timeout=timeout,
+            )
+            tracing.annotate(exit_code=0)
+        except subprocess.TimeoutExpired:
+            tracing.annotate(exit_code=None, timed_out=True)
+            raise TransportTimeout(f"gh timed out after {timeout:g}s") from None
+        except subprocess.CalledProcessError as e:
+            tracing.annotate(exit_code=e.returncode)
+            # ``gh api`` exits non-zero on partial GraphQL errors but still
+            # prints the response body; only raise when there is none.
+            try:
+                return json.loads(e.stdout or "")
+            except ValueError:
+                match = re.search(r"\bHTTP (\d{3})\b", e.stderr or "")
+                status = int(match.group(1)) if match else None
+                raise TransportError(e.stderr, status=status) from None
+        except OSError as e:
+            raise TransportError(str(e)) from None
+        try:
+            return json.loads(result.stdout)
+        except ValueError as e:
+            raise TransportError(f"invalid JSON from gh: {e}") from None
+
+
+class _ConnectionPool:
+    """LIFO pool of keep-alive ``http.client`` connections to one host."""
+
+    def __init__(self, base_url, size, timeout):
+        parsed = urlparse(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.path_prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self.created = 0
+
+    def _connect(self):
+        self.created += 1
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpTransport:
+    """In-process GitHub GraphQL client reusing pooled keep-alive connections.
+
+    Authenticates with ``GH_TOKEN`` (or ``GITHUB_TOKEN``) unless ``token``
+    is given explicitly.
+    """
+
+    name = "http"
+
+    def __init__(self, token=None, base_url=GITHUB_API_URL, pool_size=FETCH_WORKERS,
+                 timeout=REQUEST_TIMEOUT):
+        self.token = token or os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+        if not self.token:
+            raise TransportError("GH_TOKEN is not set")
+        self.pool = _ConnectionPool(base_url, pool_size, timeout)
+
+    def _request(self, method, path, body=None, timeout=None):
+        timeout = self.pool.timeout if timeout is None else timeout
+        headers = {
+            "Authorization": f"bearer {self.token}",
+            "Accept": "application/json",
+            "User-Agent": "oss-contributions",
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            try:
+                with self.pool.connection() as conn:
+                    # Pooled connections are shared, so the timeout is (re)set per request.
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    conn.request(method, self.pool.path_prefix + path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    return response, data
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                if attempt:
+                    raise TransportError(str(e)) from None
+            except TimeoutError:
+                raise TransportTimeout(f"{self.pool.host} timed out after {timeout:g}s") from None
+            except (OSError, http.client.HTTPException) as e:
+                raise TransportError(str(e)) from None
+
+    def graphql(self, query, timeout=None):
+        """POST ``query`` to ``/graphql`` and return the decoded response payload.
+
+        ``timeout`` lowers the configured timeout for this call only.
+        """
+        timeout = self.pool.timeout if timeout is None else min(self.pool.timeout, timeout)
+        response, data = self._request("POST", "/graphql", json.dumps({"query": query}), timeout)
+        tracing.annotate(status=response.status)
+        if response.status >= 400:
+            retry_after = response.getheader("Retry-After")
+            raise TransportError(
+                f"HTTP {response.status}: {data.decode('utf-8', 'replace').strip()}",
+                status=response.status,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise TransportError(f"invalid JSON from {self.pool.host}: {e}") from None
+
+    def close(self):
+        self.pool.close()
+
+
+TRANSPORTS = {
+    GhTransport.name: GhTransport,
+    HttpTransport.name: HttpTransport,
+}